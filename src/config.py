@@ -1,13 +1,16 @@
 """Configuration settings for the Discord bot."""
 
 import os
-from typing import Optional
+from typing import List, Optional, Tuple
 
 class Config:
     """Configuration class for the bot."""
-    
+
     # Discord settings
     DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
+
+    # Environment keys that must be set before the bot can start
+    REQUIRED_KEYS = ('DISCORD_TOKEN',)
     
     # Database settings (optional - can be set via !connect command)
     DEFAULT_DB_HOST = os.getenv('DB_HOST')
@@ -25,6 +28,16 @@ class Config:
     COMMAND_PREFIX = os.getenv('COMMAND_PREFIX', '!')
     MAX_RESULTS = int(os.getenv('MAX_RESULTS', '50'))
     
+    @classmethod
+    def peek_required_keys(cls) -> Tuple[bool, List[str]]:
+        """Check required environment keys without building a full config.
+
+        Reads the environment directly so startup validation can run before
+        any configuration object (and its parsing work) is constructed.
+        """
+        missing_keys = [key for key in cls.REQUIRED_KEYS if not os.getenv(key)]
+        return len(missing_keys) == 0, missing_keys
+
     @classmethod
     def validate(cls) -> bool:
         """Validate that required configuration is present."""
@@ -21,10 +21,32 @@ class ReadOnlyDatabaseService:
         self.connection = None
         self.is_connected = False
         self.host_ip = None
+        # Prepared-statement cursors keyed by SQL text; re-executing a
+        # prepared statement skips server-side parsing and planning
+        self._stmt_cache: Dict[str, Any] = {}
+        # Rows pulled off the wire per fetchmany() call; keeps large result
+        # sets from being materialised in one network read
+        self._fetch_batch = 256
+        # Server-side cap (ms) injected into every SELECT so a runaway
+        # LIKE scan is killed by MySQL instead of wedging the connection
+        self._max_execution_ms = int(os.getenv('DB_MAX_EXECUTION_MS', '2000'))
         
+    def _dispose_stmt_cache(self) -> None:
+        """Close and drop every cached prepared-statement cursor."""
+        for cursor in self._stmt_cache.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._stmt_cache.clear()
+
     def connect(self, host_ip: Optional[str] = None) -> bool:
         """Connect to the database."""
         try:
+            # Cached prepared cursors are bound to the previous connection;
+            # on a reconnect they would each fail once before being
+            # repopulated, so drop them up front
+            self._dispose_stmt_cache()
             # Use provided host_ip or try to discover
             if not host_ip:
                 host_ip = self._discover_host_ip()
@@ -89,6 +111,22 @@ class ReadOnlyDatabaseService:
         
         return None
     
+    @contextmanager
+    def session(self):
+        """Hold one authenticated connection open across several calls.
+
+        Connects on entry (if needed) and closes on exit, so a batch of
+        queries — e.g. a test run — pays the TCP + auth handshake once
+        instead of per call.
+        """
+        if not self.is_connected:
+            if not self.connect():
+                raise Exception("Database not connected")
+        try:
+            yield self.connection
+        finally:
+            self.close()
+    
     def health_check(self) -> Tuple[bool, str]:
         """Check database health."""
         try:
@@ -109,31 +147,83 @@ class ReadOnlyDatabaseService:
             self.logger.error(f"Health check failed: {e}")
             return False, f"Health check failed: {e}"
     
+    def _with_timeout_hint(self, query: str) -> str:
+        """Inject a MAX_EXECUTION_TIME optimizer hint into a SELECT.
+
+        The hint must sit directly after the SELECT keyword; MySQL then
+        aborts the statement server-side once the cap is hit, keeping tail
+        latency bounded at no extra round trip. Non-SELECT statements pass
+        through unchanged.
+        """
+        stripped = query.lstrip()
+        if stripped[:7].upper() == 'SELECT ':
+            return f"SELECT /*+ MAX_EXECUTION_TIME({self._max_execution_ms}) */ {stripped[7:]}"
+        return query
+
     def _execute_query(self, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
         """Execute a query and return results as list of dictionaries."""
         try:
             if not self.is_connected or not self.connection:
                 raise Exception("Database not connected")
-            
+
             cursor = self.connection.cursor(dictionary=True)
-            cursor.execute(query, params or ())
-            results = cursor.fetchall()
+            cursor.execute(self._with_timeout_hint(query), params or ())
+            # Drain the cursor in fixed-size batches rather than one
+            # fetchall(): same list for callers, bounded per-read buffering
+            results: List[Dict[str, Any]] = []
+            while True:
+                batch = cursor.fetchmany(self._fetch_batch)
+                if not batch:
+                    break
+                results.extend(batch)
             cursor.close()
-            
-            # Return results directly - the dictionary cursor should handle the conversion
-            return results if results else []  # type: ignore
+
+            return results  # type: ignore
         except Exception as e:
             self.logger.error(f"Query execution error: {e}")
             raise
     
+    def _execute_prepared(self, query: str, params: tuple) -> List[Dict[str, Any]]:
+        """Execute a hot query through a cached prepared-statement cursor.
+
+        The first call prepares the statement server-side; later calls with
+        the same SQL reuse the cursor and only send parameters. Rows are
+        rebuilt as dictionaries since prepared cursors return tuples.
+        """
+        if not self.is_connected or not self.connection:
+            raise Exception("Database not connected")
+
+        # Hint before the cache lookup so the cached statement carries it too
+        query = self._with_timeout_hint(query)
+        cursor = self._stmt_cache.get(query)
+        if cursor is None:
+            cursor = self.connection.cursor(prepared=True)
+            self._stmt_cache[query] = cursor
+        try:
+            cursor.execute(query, params)
+            columns = [desc[0] for desc in cursor.description]
+            results: List[Dict[str, Any]] = []
+            while True:
+                batch = cursor.fetchmany(self._fetch_batch)
+                if not batch:
+                    break
+                results.extend(dict(zip(columns, row)) for row in batch)
+            return results
+        except Exception:
+            # Drop the cursor so a broken statement doesn't poison the cache
+            self._stmt_cache.pop(query, None)
+            try:
+                cursor.close()
+            except Exception:
+                pass
+            raise
+    
     # Order queries
     def get_order_by_id(self, order_id: int) -> Optional[Dict[str, Any]]:
         """Get order by ID."""
         try:
-            query = """
-                SELECT * FROM orders WHERE id = %s
-            """
-            results = self._execute_query(query, (order_id,))
+            query = "SELECT * FROM orders WHERE id = %s"
+            results = self._execute_prepared(query, (order_id,))
             return results[0] if results else None
         except Exception as e:
             self.logger.error(f"Error getting order by ID {order_id}: {e}")
@@ -142,15 +232,57 @@ class ReadOnlyDatabaseService:
     def get_order_by_external_id(self, external_id: str) -> Optional[Dict[str, Any]]:
         """Get order by external order ID."""
         try:
-            query = """
-                SELECT * FROM orders WHERE external_order_id = %s
-            """
-            results = self._execute_query(query, (external_id,))
+            query = "SELECT * FROM orders WHERE external_order_id = %s"
+            results = self._execute_prepared(query, (external_id,))
             return results[0] if results else None
         except Exception as e:
             self.logger.error(f"Error getting order by external ID {external_id}: {e}")
             return None
     
+    def get_orders_bulk(self, external_ids: List[str],
+                        numeric_ids: Optional[List[int]] = None) -> Dict[str, Dict[str, Any]]:
+        """Look up many orders in one query instead of one per ID.
+
+        Fetches every order whose external_order_id is in external_ids or
+        whose numeric id is in numeric_ids with a single IN query, then maps
+        each requested identifier back to its row. An external-ID match wins
+        over a numeric-ID match for the same token, mirroring the order the
+        per-ID lookups were tried in.
+        """
+        numeric_ids = numeric_ids or []
+        if not external_ids and not numeric_ids:
+            return {}
+        try:
+            clauses = []
+            params: List[Any] = []
+            if external_ids:
+                placeholders = ', '.join(['%s'] * len(external_ids))
+                clauses.append(f"external_order_id IN ({placeholders})")
+                params.extend(external_ids)
+            if numeric_ids:
+                placeholders = ', '.join(['%s'] * len(numeric_ids))
+                clauses.append(f"id IN ({placeholders})")
+                params.extend(numeric_ids)
+            query = f"SELECT * FROM orders WHERE {' OR '.join(clauses)}"
+            rows = self._execute_query(query, tuple(params))
+
+            by_external = {str(row['external_order_id']): row for row in rows
+                           if row.get('external_order_id') is not None}
+            by_id = {str(row['id']): row for row in rows if row.get('id') is not None}
+
+            found = {}
+            for ext_id in external_ids:
+                if ext_id in by_external:
+                    found[ext_id] = by_external[ext_id]
+            for num_id in numeric_ids:
+                key = str(num_id)
+                if key not in found and key in by_id:
+                    found[key] = by_id[key]
+            return found
+        except Exception as e:
+            self.logger.error(f"Error getting orders in bulk: {e}")
+            return {}
+
     def search_orders(self, search_term: str) -> List[Dict[str, Any]]:
         """Search orders by customer name or order ID."""
         try:
@@ -181,29 +313,68 @@ class ReadOnlyDatabaseService:
             self.logger.error(f"Error searching orders with term {search_term}: {e}")
             return []
     
-    def get_recent_orders(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent orders."""
+    def search_orders_with_exact(self, search_term: str) -> List[Dict[str, Any]]:
+        """Search orders, tagging an exact external-ID match, in one query.
+
+        Combines the exact external_order_id lookup and the fuzzy search
+        that callers previously issued as two separate roundtrips. Rows
+        carry an 'is_exact' flag and an exact match sorts first.
+        """
         try:
+            search_pattern = f"%{search_term}%"
+            params = (search_term, search_term, search_pattern, search_pattern)
+
             # First try with created_at column
             try:
                 query = """
-                    SELECT * FROM orders 
-                    ORDER BY created_at DESC 
-                    LIMIT %s
+                    SELECT *, (external_order_id = %s) AS is_exact
+                    FROM orders
+                    WHERE external_order_id = %s
+                       OR customer_name LIKE %s OR external_order_id LIKE %s
+                    ORDER BY is_exact DESC, created_at DESC
+                    LIMIT 50
                 """
-                results = self._execute_query(query, (limit,))
+                results = self._execute_query(query, params)
                 if results is not None:
                     return results
             except Exception as e:
-                self.logger.warning(f"Recent orders with created_at failed, trying with order_date: {e}")
-            
+                self.logger.warning(f"Combined search with created_at failed, trying with order_date: {e}")
+
             # Fallback to order_date column
             query = """
-                SELECT * FROM orders 
-                ORDER BY order_date DESC 
-                LIMIT %s
+                SELECT *, (external_order_id = %s) AS is_exact
+                FROM orders
+                WHERE external_order_id = %s
+                   OR customer_name LIKE %s OR external_order_id LIKE %s
+                ORDER BY is_exact DESC, order_date DESC
+                LIMIT 50
             """
-            return self._execute_query(query, (limit,))
+            return self._execute_query(query, params)
+        except Exception as e:
+            self.logger.error(f"Error searching orders with term {search_term}: {e}")
+            return []
+
+    # Only the columns the summary formatters actually read - narrower rows
+    # over the wire than SELECT *. idx_orders_recent orders the scan by
+    # created_at so LIMIT stops early; the row fetch still touches the
+    # table since total/status/order_date are not in the index
+    _RECENT_ORDER_COLUMNS = "id, external_order_id, customer_name, total, status, order_date, created_at"
+
+    def get_recent_orders(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get recent orders."""
+        try:
+            # First try with created_at column
+            try:
+                query = f"SELECT {self._RECENT_ORDER_COLUMNS} FROM orders ORDER BY created_at DESC LIMIT %s"
+                results = self._execute_prepared(query, (limit,))
+                if results is not None:
+                    return results
+            except Exception as e:
+                self.logger.warning(f"Recent orders with created_at failed, trying with order_date: {e}")
+
+            # Fallback to order_date column
+            query = f"SELECT {self._RECENT_ORDER_COLUMNS} FROM orders ORDER BY order_date DESC LIMIT %s"
+            return self._execute_prepared(query, (limit,))
         except Exception as e:
             self.logger.error(f"Error getting recent orders: {e}")
             return []
@@ -286,6 +457,22 @@ class ReadOnlyDatabaseService:
             self.logger.error(f"Error getting all products: {e}")
             return []
     
+    def search_products(self, search_term: str) -> List[Dict[str, Any]]:
+        """Search products by name, SKU or description."""
+        try:
+            query = """
+                SELECT * FROM products
+                WHERE is_active = 1
+                  AND (LOWER(name) LIKE %s OR LOWER(sku) LIKE %s
+                       OR LOWER(description) LIKE %s)
+                ORDER BY name
+            """
+            search_pattern = f"%{search_term.lower()}%"
+            return self._execute_query(query, (search_pattern, search_pattern, search_pattern))
+        except Exception as e:
+            self.logger.error(f"Error searching products with term {search_term}: {e}")
+            return []
+
     def get_products_by_category(self, category: str) -> List[Dict[str, Any]]:
         """Get products by category."""
         try:
@@ -337,6 +524,21 @@ class ReadOnlyDatabaseService:
             self.logger.error(f"Error getting all users: {e}")
             return []
     
+    def search_users(self, search_term: str) -> List[Dict[str, Any]]:
+        """Search users by name or username."""
+        try:
+            query = """
+                SELECT * FROM users
+                WHERE is_active = 1
+                  AND (LOWER(name) LIKE %s OR LOWER(username) LIKE %s)
+                ORDER BY name
+            """
+            search_pattern = f"%{search_term.lower()}%"
+            return self._execute_query(query, (search_pattern, search_pattern))
+        except Exception as e:
+            self.logger.error(f"Error searching users with term {search_term}: {e}")
+            return []
+
     # MyACG Account queries
     def get_myacg_accounts(self) -> List[Dict[str, Any]]:
         """Get all MyACG accounts."""
@@ -454,6 +656,7 @@ class ReadOnlyDatabaseService:
     def close(self):
         """Close database connection."""
         try:
+            self._dispose_stmt_cache()
             if self.connection:
                 self.connection.close()
                 self.connection = None
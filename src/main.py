@@ -2,8 +2,11 @@
 ChatGLM3 Discord Bot - Main Entry Point
 """
 
-import sys
+import atexit
 import logging
+import logging.handlers
+import queue
+import sys
 from pathlib import Path
 
 # Add src to path for imports
@@ -12,31 +15,48 @@ if str(src_path) not in sys.path:
     sys.path.insert(0, str(src_path))
 
 from bot import ChatGLM3Bot
-from config import ConfigManager
+from config import Config
+
+# Listener draining queued log records on a background thread (started once)
+_log_listener = None
 
 def setup_logging():
     """Setup logging configuration"""
+    global _log_listener
+
+    # Don't re-open the log file if logging is already configured
+    if _log_listener is not None:
+        return
+
     # Create logs directory
     logs_dir = Path(__file__).parent.parent / 'logs'
     logs_dir.mkdir(exist_ok=True)
-    
-    # Configure logging
+
+    # File/stream writes happen on a background thread via a queue so
+    # logging in the bot's event handlers never blocks on disk I/O
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(logs_dir / 'bot.log', encoding='utf-8')
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    # Configure logging - handlers only enqueue, the listener does the writes
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(logs_dir / 'bot.log', encoding='utf-8'),
-            logging.StreamHandler()
-        ]
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
 
 def validate_environment():
     """Validate environment and configuration"""
     print("🔍 Validating environment...")
     
-    # Check configuration
-    config = ConfigManager()
-    is_valid, missing_keys = config.validate_required_keys()
+    # Check configuration keys without constructing a full config object
+    is_valid, missing_keys = Config.peek_required_keys()
     
     if not is_valid:
         print("❌ Missing required configuration:")
@@ -1,12 +1,135 @@
 """Query handler for processing Chinese questions and converting them to database queries."""
+import asyncio
 import re
+import threading
+import time
 import logging
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
 from database_reader import db_reader
 
 logger = logging.getLogger(__name__)
 
+# ASCII-only case folding for keyword matching - the CJK keywords have no
+# case, so a translate table beats a full Unicode str.lower() pass
+_ASCII_LOWER_TABLE = str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'
+)
+
+# Precompiled patterns - compiling once at import avoids the re-cache probe
+# and flag decoding that re.search(str, ...) pays on every call
+_ORDER_LIKE_RE = re.compile(r'(?:[A-Z]{2,4}\d{2,8})|(?:\d{2,10})', re.IGNORECASE)
+_NUM_RE = re.compile(r'\d+')
+
+# Routing keyword groups - a single scan over the question marks every group
+# that has a keyword hit, replacing ~20 separate substring sweeps
+_ROUTE_GROUPS = {
+    'order_id': ('訂單號', '訂單編號', 'order_id', 'order number'),
+    'sku': ('sku', '產品編號', 'product number'),
+    'recent': ('最近', 'recent', '最新', 'latest'),
+    'statistics': ('統計', 'statistics', '數據', 'data'),
+    'product': ('產品', 'product', '商品'),
+    'status': ('狀態', 'status'),
+    'category': ('分類', 'category', '類別'),
+    'myacg': ('myacg', '帳號', 'account'),
+    'health': ('健康', 'health', '連接'),
+    'search': ('搜尋', 'search', '查找', 'find'),
+    'user': ('使用者', '用戶', 'user'),
+    'customer': ('客戶', 'customer'),
+    'show': ('顯示', 'show', '列出', 'list'),
+    'order': ('訂單', 'order'),
+    'query': ('查詢', 'query', '查'),
+}
+
+# Longest-first alternation so e.g. '訂單編號' wins over '訂單' at a position
+_ROUTE_TOKENS = sorted(
+    {token for tokens in _ROUTE_GROUPS.values() for token in tokens},
+    key=len, reverse=True
+)
+_ROUTE_SCAN_RE = re.compile(
+    '|'.join(re.escape(token) for token in _ROUTE_TOKENS), re.IGNORECASE
+)
+
+# Each token implies every group with a keyword contained in it, so a hit on
+# '訂單編號' also counts as a hit for '訂單' (substring semantics preserved)
+_ROUTE_TOKEN_GROUPS = {
+    token: frozenset(
+        group for group, tokens in _ROUTE_GROUPS.items()
+        if any(t in token for t in tokens)
+    )
+    for token in _ROUTE_TOKENS
+}
+
+# Order ID extraction. An explicitly keyword-prefixed ID (訂單號12345)
+# always wins over an incidental letters+digits token elsewhere in the
+# question, so the prefix pattern gets its own first-priority pass
+_ORDER_ID_KW_RE = re.compile(
+    r'(?:訂單號|訂單編號|order_id|order\s*number|order)\s*(?P<kw>[A-Z0-9]+)',
+    re.IGNORECASE
+)
+
+# One alternation scans the question a single time: keyword-prefixed IDs
+# (訂單號PG02612345, order_id 12345), then bare codes like ORD002, then
+# long and short numeric IDs
+_ORDER_ID_RE = re.compile(
+    r'(?:訂單號|訂單編號|order_id|order\s*number|order)\s*(?P<kw>[A-Z0-9]+)'
+    r'|(?P<alpha>[A-Z]{2,4}\d{2,8})'
+    r'|(?P<long>\d{5,10})'
+    r'|(?P<short>\d{2,6})',
+    re.IGNORECASE
+)
+
+def _scan_order_code(question: str) -> Optional[str]:
+    """Single-pass scanner for order codes like ORD002 or PG02612345.
+
+    Equivalent to the [A-Z]{2,4}\\d{2,8} pattern (case-insensitive) but walks
+    the string once instead of running the regex engine over every pattern in
+    _ORDER_ID_PATTERNS. Used as the fast path in _extract_order_id.
+    """
+    n = len(question)
+    i = 0
+    while i < n:
+        ch = question[i]
+        if 'A' <= ch <= 'Z' or 'a' <= ch <= 'z':
+            run_start = i
+            while i < n and ('A' <= question[i] <= 'Z' or 'a' <= question[i] <= 'z'):
+                i += 1
+            letters = i - run_start
+            if letters >= 2 and i < n and question[i].isdigit():
+                # A longer letter run still matches on its last 4 letters,
+                # mirroring how re.search would slide the window right
+                code_start = i - min(letters, 4)
+                digit_start = i
+                while i < n and question[i].isdigit() and i - digit_start < 8:
+                    i += 1
+                if i - digit_start >= 2:
+                    return question[code_start:i]
+        else:
+            i += 1
+    return None
+
+
+# Search-term cleanup - one pass each instead of eight str.replace scans
+_SEARCH_WORD_RE = re.compile(r'搜尋|search|查找|find|查詢|query|顯示|show', re.IGNORECASE)
+_SEARCH_PREFIX_RE = re.compile(r'^(?:客戶|customer|產品|product)\s*', re.IGNORECASE)
+_SEARCH_SUFFIX_RE = re.compile(r'\s*(?:的訂單|的產品|的使用者|客戶|customer)$', re.IGNORECASE)
+
+# SKU extraction patterns
+_SKU_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'sku\s*([A-Za-z0-9\-_]+)',
+        r'产品编号\s*([A-Za-z0-9\-_]+)',
+        r'產品編號\s*([A-Za-z0-9\-_]+)',
+        r'([A-Z]{2,5}\d{3,6})'  # Common SKU pattern
+    )
+]
+
+
+class _StatusMap(dict):
+    """Status -> display-name map that falls back to the uppercased key."""
+
+    def __missing__(self, key):
+        return key.upper()
+
 
 class QueryHandler:
     """Handles Chinese question processing and database queries."""
@@ -15,8 +138,8 @@ class QueryHandler:
         """Initialize the query handler."""
         self.logger = logging.getLogger(__name__)
         
-        # Status translation mapping
-        self.status_names = {
+        # Status translation mapping (unknown statuses display uppercased)
+        self.status_names = _StatusMap({
             'processing': '處理中',
             'delivered': '已送達',
             'pending': '待處理',
@@ -24,33 +147,7 @@ class QueryHandler:
             'shipped': '已發貨',
             'closed': '關轉',
             'returned': '已退貨'
-        }
-        
-        # Chinese keywords mapping (Traditional Chinese only)
-        self.keywords = {
-            'order': ['訂單', 'order', '訂單號', 'order_id', '訂單編號'],
-            'product': ['產品', 'product', '商品', 'sku', '產品編號'],
-            'user': ['使用者', '用戶', 'user'],
-            'status': ['狀態', 'status', '狀況'],
-            'customer': ['客戶', 'customer', '顧客'],
-            'recent': ['最近', 'recent', '最新', 'latest'],
-            'statistics': ['統計', 'statistics', '數據', 'data'],
-            'search': ['搜尋', 'search', '查找', 'find'],
-            'count': ['數量', 'count', '個數', 'number'],
-            'total': ['總計', 'total', '總額', 'sum'],
-            'revenue': ['營收', 'revenue', '收益'],
-            'stock': ['庫存', 'stock', '存貨'],
-            'category': ['分類', 'category', '類別'],
-            'date': ['日期', 'date', '時間', 'time'],
-            'price': ['價格', 'price', '價錢'],
-            'cost': ['成本', 'cost', '費用'],
-            'shipping': ['運費', 'shipping', '運送'],
-            'payment': ['付款', 'payment', '支付'],
-            'invoice': ['發票', 'invoice', '收據'],
-            'coupon': ['優惠券', 'coupon', '折扣'],
-            'myacg': ['myacg', '帳號', 'account'],
-            'default': ['預設', 'default', '預設值']
-        }
+        })
         
         # Status mappings (Traditional Chinese only)
         self.status_mappings = {
@@ -62,11 +159,7 @@ class QueryHandler:
             'closed': ['關閉', 'closed', '關轉'],
             'returned': ['已退貨', 'returned', '退貨']
         }
-    
-    def _translate_status(self, status: str) -> str:
-        """Translate status to Chinese display name."""
-        return self.status_names.get(status, status.upper())
-        
+
         # Category mappings (Traditional Chinese preferred)
         self.category_mappings = {
             'mizuki': ['mizuki', '水木'],
@@ -84,12 +177,86 @@ class QueryHandler:
             'itsuki': ['itsuki', '一樹'],
             'other': ['other', '其他', '其它']
         }
-    
+
+        # Inverted token -> name maps so extraction is one flat sweep
+        # instead of a nested loop over every entry's keyword list
+        self._status_token_to_name = {
+            keyword: status
+            for status, keywords in self.status_mappings.items()
+            for keyword in keywords
+        }
+        self._category_token_to_name = {
+            keyword: category
+            for category, keywords in self.category_mappings.items()
+            for keyword in keywords
+        }
+
+        # Query-type -> handler dispatch table (replaces an if/elif chain)
+        self._handlers = {
+            'order_search': self._handle_order_search,
+            'order_by_id': self._handle_order_by_id,
+            'order_by_status': self._handle_order_by_status,
+            'recent_orders': self._handle_recent_orders,
+            'product_search': self._handle_product_search,
+            'product_by_sku': self._handle_product_by_sku,
+            'products_by_category': self._handle_products_by_category,
+            'user_search': self._handle_user_search,
+            'order_statistics': self._handle_order_statistics,
+            'product_statistics': self._handle_product_statistics,
+            'myacg_accounts': self._handle_myacg_accounts,
+            'health_check': self._handle_health_check,
+        }
+
+        # Short-lived cache of full query results keyed by normalized
+        # question - chat users frequently repeat the same query
+        self._result_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._result_cache_ttl = 30.0  # seconds
+        self._result_cache_max = 128
+
+        # Per-question memo so status/category extraction never rescans the
+        # keyword lists twice for the same question (reset per request)
+        self._extract_memo: Dict[str, Any] = {}
+
+        # Serialises process_question_async workers: they all share the
+        # global db_reader, whose mysql.connector connection and prepared-
+        # statement cursors are not thread-safe
+        self._db_lock = threading.Lock()
+
+    def _translate_status(self, status: str) -> str:
+        """Translate status to Chinese display name."""
+        # _StatusMap.__missing__ supplies the uppercased fallback, so this
+        # is a plain C-level dict lookup
+        return self.status_names[status]
+
+    def _process_question_locked(self, question: str) -> Dict[str, Any]:
+        """Run process_question under the shared-connection lock."""
+        with self._db_lock:
+            return self.process_question(question)
+
+    async def process_question_async(self, question: str) -> Dict[str, Any]:
+        """Process a question without blocking the event loop.
+
+        db_reader is a synchronous mysql.connector client, so the work is
+        pushed to a worker thread; the awaiting loop stays free to handle
+        other Discord events while the query runs.
+
+        Concurrency contract: callers may gather any number of these, but
+        the underlying queries are serialised on one lock — the handler
+        talks to the single global db_reader connection, which is not
+        thread-safe. Fanning out buys loop responsiveness, not database
+        parallelism; true parallel queries need their own
+        ReadOnlyDatabaseService instances (see test_database.py's
+        _phase_on_own_connection).
+        """
+        return await asyncio.to_thread(self._process_question_locked, question)
+
     def process_question(self, question: str) -> Dict[str, Any]:
         """Process a Chinese question and return database query results."""
         try:
-            question_lower = question.lower()
-            
+            # ASCII fold only - every keyword we match against is either
+            # ASCII or case-invariant CJK
+            question_lower = question.translate(_ASCII_LOWER_TABLE)
+
             # Check database connection first
             if not db_reader.is_connected:
                             return {
@@ -97,41 +264,40 @@ class QueryHandler:
                 'error': '資料庫未連接，請先連接資料庫',
                 'data': None
             }
-            
+
+            # Serve repeated questions from the short-lived result cache
+            cache_key = question_lower.strip()
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                cached_at, cached_result = cached
+                if time.monotonic() - cached_at < self._result_cache_ttl:
+                    return cached_result
+                del self._result_cache[cache_key]
+
+            # Fresh extraction memo for this question
+            self._extract_memo = {'question': question_lower}
+
             # Determine query type based on keywords
             query_type = self._determine_query_type(question_lower)
-            
-            if query_type == 'order_search':
-                return self._handle_order_search(question)
-            elif query_type == 'order_by_id':
-                return self._handle_order_by_id(question)
-            elif query_type == 'order_by_status':
-                return self._handle_order_by_status(question)
-            elif query_type == 'recent_orders':
-                return self._handle_recent_orders(question)
-            elif query_type == 'product_search':
-                return self._handle_product_search(question)
-            elif query_type == 'product_by_sku':
-                return self._handle_product_by_sku(question)
-            elif query_type == 'products_by_category':
-                return self._handle_products_by_category(question)
-            elif query_type == 'user_search':
-                return self._handle_user_search(question)
-            elif query_type == 'order_statistics':
-                return self._handle_order_statistics(question)
-            elif query_type == 'product_statistics':
-                return self._handle_product_statistics(question)
-            elif query_type == 'myacg_accounts':
-                return self._handle_myacg_accounts(question)
-            elif query_type == 'health_check':
-                return self._handle_health_check(question)
+
+            handler = self._handlers.get(query_type)
+            if handler is not None:
+                result = handler(question, question_lower)
             else:
-                            return {
-                'success': False,
-                'error': '無法理解您的問題，請嘗試更具體的查詢',
-                'data': None
-            }
-                
+                result = {
+                    'success': False,
+                    'error': '無法理解您的問題，請嘗試更具體的查詢',
+                    'data': None
+                }
+
+            # Only cache successful lookups that actually returned data
+            if result.get('success') and result.get('data') is not None:
+                if len(self._result_cache) >= self._result_cache_max:
+                    self._result_cache.clear()
+                self._result_cache[cache_key] = (time.monotonic(), result)
+
+            return result
+
         except Exception as e:
             self.logger.error(f"Error processing question: {e}")
             return {
@@ -142,52 +308,57 @@ class QueryHandler:
     
     def _determine_query_type(self, question: str) -> str:
         """Determine the type of query based on keywords in the question."""
-        question_lower = question.lower()
-        
-        # Check for specific patterns first (improved order number detection)
-        if any(word in question for word in ['訂單號', '訂單編號', 'order_id', 'order number']):
+        # Single pass over the question: collect every keyword-group hit
+        hits = set()
+        for match in _ROUTE_SCAN_RE.finditer(question):
+            hits |= _ROUTE_TOKEN_GROUPS[match.group(0).lower()]
+
+        # Decide the route from the hit set with fixed priority
+        # (improved order number detection first)
+        if 'order_id' in hits:
             return 'order_by_id'
-        elif any(word in question for word in ['sku', '產品編號', 'product number']):
+        elif 'sku' in hits:
             return 'product_by_sku'
-        elif any(word in question for word in ['最近', 'recent', '最新', 'latest']):
+        elif 'recent' in hits:
             return 'recent_orders'
-        elif any(word in question for word in ['統計', 'statistics', '數據', 'data']):
-            if any(word in question for word in ['產品', 'product', '商品']):
+        elif 'statistics' in hits:
+            if 'product' in hits:
                 return 'product_statistics'
             else:
                 return 'order_statistics'
-        elif any(word in question for word in ['狀態', 'status']):
+        elif 'status' in hits:
             return 'order_by_status'
-        elif any(word in question for word in ['分類', 'category', '類別']):
+        elif 'category' in hits:
             return 'products_by_category'
-        elif any(word in question for word in ['myacg', '帳號', 'account']):
+        elif 'myacg' in hits:
             return 'myacg_accounts'
-        elif any(word in question for word in ['健康', 'health', '連接']):
+        elif 'health' in hits:
             return 'health_check'
-        elif any(word in question for word in ['搜尋', 'search', '查找', 'find']):
-            if any(word in question for word in ['產品', 'product', '商品']):
+        elif 'search' in hits:
+            if 'product' in hits:
                 return 'product_search'
-            elif any(word in question for word in ['使用者', '用戶', 'user']):
+            elif 'user' in hits:
                 return 'user_search'
             else:
                 return 'order_search'
-        elif any(word in question for word in ['客戶', 'customer']):
+        elif 'customer' in hits:
             return 'order_search'
-        elif any(word in question for word in ['顯示', 'show', '列出', 'list']):
-            if any(word in question for word in ['產品', 'product', '商品']):
+        elif 'show' in hits:
+            if 'product' in hits:
                 return 'product_search'
-            elif any(word in question for word in ['訂單', 'order']):
+            elif 'order' in hits:
                 return 'recent_orders'
             else:
                 return 'order_search'
-        elif any(word in question for word in ['查詢', 'query', '查']):
-            # Check if it contains order-like patterns
-            if re.search(r'[A-Z]{2,4}\d{2,8}', question, re.IGNORECASE) or re.search(r'\d{2,10}', question):
-                return 'order_by_id'
-            elif any(word in question for word in ['產品', 'product', '商品']):
+        elif 'query' in hits:
+            # Cheap keyword hits first; only fall back to the order-like
+            # regex when neither keyword matched
+            if 'product' in hits:
                 return 'product_search'
-            elif any(word in question for word in ['訂單', 'order']):
+            elif 'order' in hits:
                 return 'order_search'
+            elif _ORDER_LIKE_RE.search(question):
+                return 'order_by_id'
             else:
                 return 'order_search'
         else:
@@ -196,107 +367,103 @@ class QueryHandler:
     
     def _extract_order_id(self, question: str) -> Optional[str]:
         """Extract order ID from question."""
-        # Look for patterns like "訂單號12345" or "order_id 12345" or "ORD002" or "PG02612345"
-        patterns = [
-            r'訂單號\s*([A-Z0-9]+)',  # 訂單號PG02612345
-            r'訂單編號\s*([A-Z0-9]+)',  # 訂單編號ORD002
-            r'order_id\s*([A-Z0-9]+)',  # order_id PG02612345
-            r'order\s*number\s*([A-Z0-9]+)',  # order number ORD002
-            r'order\s*([A-Z0-9]+)',  # order PG02612345
-            r'([A-Z]{2,4}\d{2,8})',  # Pattern for ORD002, PG02612345, etc.
-            r'(\d{5,10})',  # General pattern for numeric order IDs
-            r'(\d{2,6})'  # Shorter numeric patterns
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, question, re.IGNORECASE)
-            if match:
-                order_id = match.group(1)
-                # Clean up the order ID
-                order_id = order_id.strip()
-                if order_id:
-                    return order_id
-        return None
+        # An explicit 訂單號/order_id prefix names the ID the user means;
+        # check it before the bare-code scanner so a stray letters+digits
+        # token (a name like Bob42) can't shadow it
+        match = _ORDER_ID_KW_RE.search(question)
+        if match:
+            order_id = match.group('kw').strip()
+            if order_id:
+                return order_id
+
+        # Fast path: a single character scan finds letter+digit codes like
+        # ORD002 or PG02612345 without touching the regex engine
+        order_code = _scan_order_code(question)
+        if order_code:
+            return order_code
+
+        # Remaining shapes (long/short bare numeric IDs) - one combined
+        # alternation instead of separate scans
+        match = _ORDER_ID_RE.search(question)
+        if not match:
+            return None
+
+        order_id = (match.group('kw') or match.group('alpha') or
+                    match.group('long') or match.group('short')).strip()
+        return order_id if order_id else None
     
     def _extract_sku(self, question: str) -> Optional[str]:
         """Extract SKU from question."""
         # Look for SKU patterns
-        patterns = [
-            r'sku\s*([A-Za-z0-9\-_]+)',
-            r'产品编号\s*([A-Za-z0-9\-_]+)',
-            r'產品編號\s*([A-Za-z0-9\-_]+)',
-            r'([A-Z]{2,5}\d{3,6})'  # Common SKU pattern
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, question, re.IGNORECASE)
+        for pattern in _SKU_PATTERNS:
+            match = pattern.search(question)
             if match:
                 return match.group(1)
         return None
     
-    def _extract_status(self, question: str) -> Optional[str]:
-        """Extract order status from question."""
-        question_lower = question.lower()
-        
-        for status, keywords in self.status_mappings.items():
-            if any(keyword in question_lower for keyword in keywords):
-                return status
-        return None
+    def _extract_status(self, question_lower: str) -> Optional[str]:
+        """Extract order status from the pre-lowered question."""
+        memo = self._extract_memo
+        if memo.get('question') == question_lower and 'status' in memo:
+            return memo['status']
+
+        status = None
+        for keyword, name in self._status_token_to_name.items():
+            if keyword in question_lower:
+                status = name
+                break
+
+        if memo.get('question') == question_lower:
+            memo['status'] = status
+        return status
     
-    def _extract_category(self, question: str) -> Optional[str]:
-        """Extract product category from question."""
-        question_lower = question.lower()
-        
-        for category, keywords in self.category_mappings.items():
-            if any(keyword in question_lower for keyword in keywords):
-                return category
-        return None
+    def _extract_category(self, question_lower: str) -> Optional[str]:
+        """Extract product category from the pre-lowered question."""
+        memo = self._extract_memo
+        if memo.get('question') == question_lower and 'category' in memo:
+            return memo['category']
+
+        category = None
+        for keyword, name in self._category_token_to_name.items():
+            if keyword in question_lower:
+                category = name
+                break
+
+        if memo.get('question') == question_lower:
+            memo['category'] = category
+        return category
     
     def _extract_search_term(self, question: str) -> str:
         """Extract search term from question."""
-        # Remove common question words and extract the main search term
-        question_words = ['搜尋', 'search', '查找', 'find', '查詢', 'query', '顯示', 'show']
-        search_term = question
-        
-        for word in question_words:
-            search_term = search_term.replace(word, '').strip()
-        
-        # Remove common prefixes
-        prefixes = ['客戶', 'customer', '產品', 'product']
-        for prefix in prefixes:
-            if search_term.startswith(prefix):
-                search_term = search_term[len(prefix):].strip()
-        
-        # Remove common suffixes
-        suffixes = ['的訂單', '的產品', '的使用者', '客戶', 'customer']
-        for suffix in suffixes:
-            if search_term.endswith(suffix):
-                search_term = search_term[:-len(suffix)].strip()
-        
-        # Clean up the search term
+        # Strip question words, then common prefixes/suffixes - each a
+        # single compiled-regex pass instead of per-word replace scans
+        search_term = _SEARCH_WORD_RE.sub('', question).strip()
+        search_term = _SEARCH_PREFIX_RE.sub('', search_term)
+        search_term = _SEARCH_SUFFIX_RE.sub('', search_term)
         search_term = search_term.strip()
-        
+
         # If search term is empty, return the original question
         return search_term if search_term else question
     
-    def _handle_order_search(self, question: str) -> Dict[str, Any]:
+    def _handle_order_search(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle order search queries."""
         search_term = self._extract_search_term(question)
         
-        # If the search term looks like an order ID, try direct order lookup first
-        if re.search(r'[A-Z]{2,4}\d{2,8}', search_term, re.IGNORECASE) or re.search(r'\d{2,10}', search_term):
-            # Try to get order by external ID first
-            order = db_reader.get_order_by_external_id(search_term)
-            if order:
-                return {
-                    'success': True,
-                    'message': f'找到訂單 {search_term}',
-                    'data': order
-                }
-        
-        # Fallback to general search
-        orders = db_reader.search_orders(search_term)
-        
+        # One roundtrip covers both the exact external-ID lookup and the
+        # fuzzy search; an exact match comes back first with is_exact set
+        results = db_reader.search_orders_with_exact(search_term)
+
+        if results and results[0].get('is_exact'):
+            order = {k: v for k, v in results[0].items() if k != 'is_exact'}
+            return {
+                'success': True,
+                'message': f'找到訂單 {search_term}',
+                'data': order
+            }
+
+        orders = [{k: v for k, v in row.items() if k != 'is_exact'}
+                  for row in results]
+
         if not orders:
             return {
                 'success': True,
@@ -310,7 +477,7 @@ class QueryHandler:
             'data': orders
         }
     
-    def _handle_order_by_id(self, question: str) -> Dict[str, Any]:
+    def _handle_order_by_id(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle order by ID queries."""
         order_id = self._extract_order_id(question)
         
@@ -354,9 +521,9 @@ class QueryHandler:
                 'data': None
             }
     
-    def _handle_order_by_status(self, question: str) -> Dict[str, Any]:
+    def _handle_order_by_status(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle order by status queries."""
-        status = self._extract_status(question)
+        status = self._extract_status(question_lower)
         
         if not status:
             return {
@@ -373,14 +540,14 @@ class QueryHandler:
             'data': orders
         }
     
-    def _handle_recent_orders(self, question: str) -> Dict[str, Any]:
+    def _handle_recent_orders(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle recent orders queries."""
         # Extract limit from question if specified
         limit = 10
-        limit_match = re.search(r'(\d+)', question)
+        limit_match = _NUM_RE.search(question)
         if limit_match:
             try:
-                limit = int(limit_match.group(1))
+                limit = int(limit_match.group(0))
                 limit = min(limit, 50)  # Cap at 50
             except ValueError:
                 pass
@@ -393,19 +560,14 @@ class QueryHandler:
             'data': orders
         }
     
-    def _handle_product_search(self, question: str) -> Dict[str, Any]:
+    def _handle_product_search(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle product search queries."""
         search_term = self._extract_search_term(question)
-        products = db_reader.get_all_products()
-        
-        # Filter products by search term
-        filtered_products = []
-        for product in products:
-            if (search_term.lower() in product['name'].lower() or 
-                search_term.lower() in product['sku'].lower() or
-                (product['description'] and search_term.lower() in product['description'].lower())):
-                filtered_products.append(product)
-        
+
+        # Let the database do the matching instead of filtering every
+        # product row in Python
+        filtered_products = db_reader.search_products(search_term)
+
         if not filtered_products:
             return {
                 'success': True,
@@ -419,7 +581,7 @@ class QueryHandler:
             'data': filtered_products
         }
     
-    def _handle_product_by_sku(self, question: str) -> Dict[str, Any]:
+    def _handle_product_by_sku(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle product by SKU queries."""
         sku = self._extract_sku(question)
         
@@ -445,9 +607,9 @@ class QueryHandler:
             'data': product
         }
     
-    def _handle_products_by_category(self, question: str) -> Dict[str, Any]:
+    def _handle_products_by_category(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle products by category queries."""
-        category = self._extract_category(question)
+        category = self._extract_category(question_lower)
         
         if not category:
             return {
@@ -464,18 +626,14 @@ class QueryHandler:
             'data': products
         }
     
-    def _handle_user_search(self, question: str) -> Dict[str, Any]:
+    def _handle_user_search(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle user search queries."""
         search_term = self._extract_search_term(question)
-        users = db_reader.get_all_users()
-        
-        # Filter users by search term
-        filtered_users = []
-        for user in users:
-            if (search_term.lower() in user['name'].lower() or 
-                search_term.lower() in user['username'].lower()):
-                filtered_users.append(user)
-        
+
+        # Let the database do the matching instead of filtering every
+        # user row in Python
+        filtered_users = db_reader.search_users(search_term)
+
         if not filtered_users:
             return {
                 'success': True,
@@ -489,7 +647,7 @@ class QueryHandler:
             'data': filtered_users
         }
     
-    def _handle_order_statistics(self, question: str) -> Dict[str, Any]:
+    def _handle_order_statistics(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle order statistics queries."""
         stats = db_reader.get_order_statistics()
         
@@ -499,7 +657,7 @@ class QueryHandler:
             'data': stats
         }
     
-    def _handle_product_statistics(self, question: str) -> Dict[str, Any]:
+    def _handle_product_statistics(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle product statistics queries."""
         stats = db_reader.get_product_statistics()
         
@@ -509,7 +667,7 @@ class QueryHandler:
             'data': stats
         }
     
-    def _handle_myacg_accounts(self, question: str) -> Dict[str, Any]:
+    def _handle_myacg_accounts(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle MyACG accounts queries."""
         accounts = db_reader.get_myacg_accounts()
         
@@ -519,7 +677,7 @@ class QueryHandler:
             'data': accounts
         }
     
-    def _handle_health_check(self, question: str) -> Dict[str, Any]:
+    def _handle_health_check(self, question: str, question_lower: str) -> Dict[str, Any]:
         """Handle database health check queries."""
         is_healthy, message = db_reader.health_check()
         
@@ -536,27 +694,39 @@ class QueryHandler:
         """Format the query result into a readable response."""
         if not result['success']:
             return f"❌ 錯誤: {result['error']}"
-        
-        # Handle None data or empty data
-        if result['data'] is None or (isinstance(result['data'], list) and len(result['data']) == 0):
-            return f"ℹ️ {result['message']}"
-        
-        # Format based on data type
-        if isinstance(result['data'], list):
-            if not result['data']:
-                return f"ℹ️ {result['message']}"
-            
-            # Format list data
-            if len(result['data']) == 1:
-                return self._format_single_item(result['data'][0], result['message'])
+
+        # Results replayed from the question cache carry their rendered
+        # text with them, so a repeated question skips the whole
+        # formatting pass as well as the query
+        formatted = result.get('_formatted')
+        if formatted is not None:
+            return formatted
+        formatted = self._render_response(result)
+        result['_formatted'] = formatted
+        return formatted
+
+    def _render_response(self, result: Dict[str, Any]) -> str:
+        """Build the response text for a successful result."""
+        # Bind data/message once and dispatch on the concrete type
+        data = result['data']
+        message = result['message']
+
+        if data is None:
+            return f"ℹ️ {message}"
+
+        data_type = type(data)
+        if data_type is list:
+            count = len(data)
+            if count == 0:
+                return f"ℹ️ {message}"
+            elif count == 1:
+                return self._format_single_item(data[0], message)
             else:
-                return self._format_list_summary(result['data'], result['message'])
-        
-        elif isinstance(result['data'], dict):
-            return self._format_dict_data(result['data'], result['message'])
-        
+                return self._format_list_summary(data, message)
+        elif data_type is dict:
+            return self._format_dict_data(data, message)
         else:
-            return f"✅ {result['message']}\n{result['data']}"
+            return f"✅ {message}\n{data}"
     
     def _format_single_item(self, item: Dict[str, Any], message: str) -> str:
         """Format a single item response."""
@@ -571,27 +741,33 @@ class QueryHandler:
             # Translate status to Chinese
             status_display = self._translate_status(item['status'])
             
-            return f"✅ {message}\n" + \
-                   f"訂單號: {item['external_order_id']}\n" + \
-                   f"客戶: {item['customer_name']}\n" + \
-                   f"狀態: {status_display}\n" + \
-                   f"總金額: ${item['total']:.2f}\n" + \
-                   f"訂單日期: {order_date_str}"
-        
+            return "\n".join([
+                f"✅ {message}",
+                f"訂單號: {item['external_order_id']}",
+                f"客戶: {item['customer_name']}",
+                f"狀態: {status_display}",
+                f"總金額: ${item['total']:.2f}",
+                f"訂單日期: {order_date_str}"
+            ])
+
         elif 'sku' in item:  # Product
-            return f"✅ {message}\n" + \
-                   f"SKU: {item['sku']}\n" + \
-                   f"名稱: {item['name']}\n" + \
-                   f"價格: ${item['price']:.2f}\n" + \
-                   f"庫存: {item['stock_quantity']}\n" + \
-                   f"分類: {item['category']}"
-        
+            return "\n".join([
+                f"✅ {message}",
+                f"SKU: {item['sku']}",
+                f"名稱: {item['name']}",
+                f"價格: ${item['price']:.2f}",
+                f"庫存: {item['stock_quantity']}",
+                f"分類: {item['category']}"
+            ])
+
         elif 'username' in item and 'api_key' in item:  # MyACG Account
-            return f"✅ {message}\n" + \
-                   f"名稱: {item['name']}\n" + \
-                   f"使用者名: {item['username']}\n" + \
-                   f"預設帳戶: {'是' if item['is_default'] else '否'}"
-        
+            return "\n".join([
+                f"✅ {message}",
+                f"名稱: {item['name']}",
+                f"使用者名: {item['username']}",
+                f"預設帳戶: {'是' if item['is_default'] else '否'}"
+            ])
+
         else:  # Generic
             return f"✅ {message}\n{str(item)}"
     
@@ -600,10 +776,15 @@ class QueryHandler:
         if not items:
             return f"ℹ️ {message}"
         
-        # Show first few items and total count
+        # Show first few items and total count; accumulate lines in a list
+        # and join once instead of growing the summary string per row
         display_count = min(5, len(items))
-        summary = f"✅ {message}\n\n"
-        
+        lines = [f"✅ {message}", ""]
+
+        # Hoist the per-row lookups out of the loop
+        append = lines.append
+        translate = self.status_names.__getitem__
+
         for i, item in enumerate(items[:display_count]):
             if 'external_order_id' in item:  # Order
                 # Format datetime for order date
@@ -612,21 +793,23 @@ class QueryHandler:
                     date_str = order_date.strftime('%m-%d')
                 else:
                     date_str = 'N/A'
-                
+
                 # Translate status to Chinese
-                status_display = self._translate_status(item['status'])
-                
-                summary += f"{i+1}. 訂單 {item['external_order_id']} - {item['customer_name']} (${item['total']:.2f}) [{status_display}] {date_str}\n"
+                status_display = translate(item['status'])
+
+                append(f"{i+1}. 訂單 {item['external_order_id']} - {item['customer_name']} (${item['total']:.2f}) [{status_display}] {date_str}")
             elif 'sku' in item:  # Product
-                summary += f"{i+1}. {item['sku']} - {item['name']} (${item['price']:.2f})\n"
+                append(f"{i+1}. {item['sku']} - {item['name']} (${item['price']:.2f})")
             elif 'username' in item:  # User
-                summary += f"{i+1}. {item['name']} ({item['username']})\n"
+                append(f"{i+1}. {item['name']} ({item['username']})")
             else:
-                summary += f"{i+1}. {str(item)}\n"
-        
+                append(f"{i+1}. {str(item)}")
+
+        summary = "\n".join(lines) + "\n"
+
         if len(items) > display_count:
             summary += f"\n... 還有 {len(items) - display_count} 項"
-        
+
         return summary
     
     def _format_dict_data(self, data: Dict[str, Any], message: str) -> str:
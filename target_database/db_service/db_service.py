@@ -1,25 +1,62 @@
 """Database service for handling all database operations."""
-from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError
-from datetime import datetime, time
+from typing import Iterator, List, Optional, Dict, Any, Tuple
+from sqlalchemy.orm import Session, selectinload, raiseload
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from datetime import datetime, time, timedelta
 import logging
-from sqlalchemy import text
+from sqlalchemy import text, update, select, func, event, delete, exists, bindparam
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+import asyncio
+import time as time_module
 import socket
 import json
 import os
+import types
 import logging
 from typing import Optional, Dict, Any
 from pathlib import Path
 
-# Try to import mysql.connector, with fallback to pymysql
+# Try to import mysql.connector, falling back through the fastest driver
+# available: mysqlclient's C binding decodes rows several times faster than
+# pure-Python pymysql, so prefer it when mysql-connector is missing
 try:
     import mysql.connector
     MYSQL_AVAILABLE = True
+    _fallback_driver = None
 except ImportError:
     MYSQL_AVAILABLE = False
-    logging.warning("mysql-connector-python not available, using pymysql fallback")
+    try:
+        import MySQLdb as _fallback_driver
+        logging.warning("mysql-connector-python not available, using mysqlclient fallback")
+    except ImportError:
+        import pymysql as _fallback_driver
+        logging.warning("mysql-connector-python and mysqlclient not available, using pymysql fallback")
+
+# Bind the driver's connect once at import so per-attempt code doesn't
+# re-branch on driver availability
+_connect_fn = mysql.connector.connect if MYSQL_AVAILABLE else _fallback_driver.connect
+
+# Default connection parameters, built once and frozen, split by use:
+# the credential keys are what save_config persists to db_config.json,
+# while the session/handshake keys only shape the live connection —
+# autocommit avoids the implicit-transaction commit round trip on writes,
+# and declaring the charset/collation in the handshake skips the
+# follow-up SET NAMES the connector would otherwise issue.
+_CREDENTIAL_DEFAULTS = types.MappingProxyType({
+    "user": "root",
+    "password": "Meridian0723",
+    "database": "MyACG_data",
+    "port": 3306,
+})
+_SESSION_DEFAULTS = types.MappingProxyType({
+    "autocommit": True,
+    "charset": "utf8mb4",
+    "use_unicode": True,
+    "collation": "utf8mb4_unicode_ci",
+})
+_CONNECT_DEFAULTS = types.MappingProxyType({**_CREDENTIAL_DEFAULTS, **_SESSION_DEFAULTS})
 
 from packing_elf.models.database import SessionLocal
 from packing_elf.models.user import User, Role, MyACGAccount
@@ -28,6 +65,29 @@ from packing_elf.models.product import Product, ProductCategory
 from packing_elf.models.shipping import ShippingLabel, PackingSlip
 from packing_elf.services.password_service import password_service
 
+# Eager-load options for the relationships the UI reads from detached
+# objects; applying them at query time replaces the per-row attribute
+# touching that previously forced N+1 lazy loads
+_ORDER_LOADS = (selectinload(Order.created_by), selectinload(Order.myacg_account))
+_USER_LOADS = (selectinload(User.roles),)
+
+# Strict mode: any relationship access outside the eager-loaded set raises
+# instead of silently issuing a lazy SELECT, so N+1 regressions fail loudly
+# in development rather than showing up as production latency
+if os.getenv('PACKING_ELF_STRICT_LOADS'):
+    _ORDER_LOADS = _ORDER_LOADS + (raiseload('*'),)
+    _USER_LOADS = _USER_LOADS + (raiseload('*'),)
+
+# Hot parametric statements built once at import; executing the same
+# construct with fresh bind values skips per-call Query construction and
+# guarantees compiled-SQL cache hits
+_Q_USER_BY_USERNAME = select(User).options(*_USER_LOADS).where(User.username == bindparam('username'))
+_Q_ORDER_BY_EXTID = select(Order).options(*_ORDER_LOADS).where(Order.external_order_id == bindparam('ext'))
+_Q_RECENT_ORDERS = select(Order).options(*_ORDER_LOADS).order_by(Order.created_at.desc()).limit(bindparam('n'))
+_Q_PRODUCT_BY_SKU = select(Product).where(Product.sku == bindparam('sku'))
+_Q_ACCOUNT_BY_NAME = select(MyACGAccount).where(MyACGAccount.name == bindparam('name'))
+_Q_DEFAULT_ACCOUNT = select(MyACGAccount).where(MyACGAccount.is_default == True)
+
 
 class DatabaseError(Exception):
     """Base exception for database operations."""
@@ -47,78 +107,90 @@ class OrderNotFoundError(DatabaseError):
 class DatabaseService:
     """Service for database operations with proper session management."""
 
+    # Pre-built probes for the fixed set of critical tables; identical SQL
+    # text on every call lets the server's statement cache hit, and the
+    # whitelist means no runtime string formatting into SQL
+    _HEALTH_QUERIES = {
+        table: text(f"SELECT 1 FROM {table} LIMIT 1")
+        for table in ('users', 'orders', 'products')
+    }
+
     def __init__(self):
         """Initialize database service."""
         self.logger = logging.getLogger(__name__)
         self.logger.info("Initializing DatabaseService")
-
-    def _load_order_attributes(self, orders: List[Order]) -> List[Order]:
-        """Load all Order attributes to prevent DetachedInstanceError."""
-        for order in orders:
-            # Access all scalar attributes that might be used by the UI
-            # Force load by accessing the actual values
-            order.created_at  # This should trigger loading
-            order.updated_at
-            order.external_order_id
-            order.invoice
-            order.status
-            order.customer_name
-            order.notes
-            order.coupon
-            order.order_date
-            order.total
-            order.shipping_cost
-            order.payment_method
-            order.export_to_excel
-            
-            # Handle relationships carefully - load the IDs at least
-            try:
-                order.created_by_id
-                if order.created_by:
-                    order.created_by.name
-            except:
-                pass
+        # Short-TTL cache for the hot point lookups (user by id/username,
+        # order by external id) that the UI re-issues many times per action
+        self._lookup_cache: Dict[Tuple[str, Any], Tuple[float, Any]] = {}
+        self._lookup_cache_ttl = 30.0
+        self._lookup_cache_max = 256
+        # Bounded executor for running sync DB calls from async handlers;
+        # sized to the engine's default pool so concurrent chatbot requests
+        # overlap up to pool capacity without starving the pool
+        self._executor = ThreadPoolExecutor(max_workers=5, thread_name_prefix='db')
+        # Decrypted-password memo: symmetric decryption per call costs more
+        # CPU than the lookup itself when the same account is used for every
+        # action. Small, short-TTL, cleared on any account write.
+        self._pw_cache: Dict[int, Tuple[float, str]] = {}
+        self._pw_cache_ttl = 300.0
+        self._pw_cache_max = 32
+        # Memoized table verification for health_check (monotonic seconds)
+        self._tables_verified_at = float('-inf')
+        self._tables_verify_interval = 300.0
+        # Opt-in statement counter so N+1 regressions show up as a number
+        # instead of a vague slowdown; enabled via PACKING_ELF_DEBUG_SQL
+        self._query_count = 0
+        if os.getenv('PACKING_ELF_DEBUG_SQL'):
             try:
-                order.myacg_account_id
-                if order.myacg_account:
-                    order.myacg_account.name
-            except:
-                pass
-        return orders
-
-    def _load_myacg_account_attributes(self, accounts: List) -> List:
-        """Load all MyACGAccount attributes to prevent DetachedInstanceError."""
-        for account in accounts:
-            # Access all scalar attributes that might be used by the UI
-            account.id
-            account.name
-            account.username
-            account.encrypted_password
-            account.api_key
-            account.is_default
-            account.created_at
-            account.updated_at
-        return accounts
-
-    def _load_user_attributes(self, users: List) -> List:
-        """Load all User attributes to prevent DetachedInstanceError."""
-        for user in users:
-            # Access all scalar attributes that might be used by the UI
-            user.id
-            user.name
-            user.username
-            user.hashed_password
-            user.is_active
-            user.created_at
-            user.updated_at
-            
-            # Handle relationships carefully
-            try:
-                # Access the roles relationship
-                list(user.roles)  # Force load the roles
-            except:
-                pass
-        return users
+                from packing_elf.models.database import engine
+                event.listen(engine, 'before_cursor_execute', self._count_query)
+                self.logger.info("SQL statement counting enabled")
+            except Exception as e:
+                self.logger.error(f"Could not enable SQL statement counting: {e}")
+        # DDL at startup is opt-in: the singleton is built at import time
+        # and some deployments run with credentials that may not create
+        # indexes. ensure_search_indexes is a no-op once they exist.
+        if os.getenv('PACKING_ELF_ENSURE_INDEXES'):
+            self.ensure_search_indexes()
+
+    def _count_query(self, conn, cursor, statement, parameters, context, executemany):
+        """Engine event hook: count every statement sent to the database."""
+        self._query_count += 1
+
+    @property
+    def query_count(self) -> int:
+        """Number of statements executed since startup or the last reset."""
+        return self._query_count
+
+    def reset_query_count(self) -> None:
+        """Reset the statement counter (e.g. around a section under test)."""
+        self._query_count = 0
+
+    def _cached_lookup(self, key: Tuple[str, Any]) -> Tuple[bool, Any]:
+        """Return (hit, value) for a cached lookup that is still fresh."""
+        entry = self._lookup_cache.get(key)
+        if entry is not None:
+            cached_at, value = entry
+            if time_module.monotonic() - cached_at < self._lookup_cache_ttl:
+                return True, value
+            del self._lookup_cache[key]
+        return False, None
+
+    def _store_lookup(self, key: Tuple[str, Any], value: Any) -> None:
+        """Cache a lookup result, evicting stale entries when full."""
+        if len(self._lookup_cache) >= self._lookup_cache_max:
+            self._lookup_cache.clear()
+        self._lookup_cache[key] = (time_module.monotonic(), value)
+
+    def _invalidate_lookups(self, kind: str) -> None:
+        """Drop cached lookups of the given kind after a write."""
+        kinds = {kind}
+        if kind == 'account':
+            # The default-account entry lives under its own namespace
+            kinds.add('account_default')
+            self._pw_cache.clear()
+        for key in [k for k in self._lookup_cache if k[0] in kinds]:
+            del self._lookup_cache[key]
 
     def _extract_user_data(self, user: User) -> Dict[str, Any]:
         """Extract user data into a dictionary to prevent DetachedInstanceError."""
@@ -136,6 +208,12 @@ class DatabaseService:
     def get_session(self):
         """Get a database session with proper cleanup and transaction management."""
         session = SessionLocal()
+        # Keep attributes usable after the commit; without this the commit
+        # expires every loaded object and returned instances would need the
+        # old expunge/touch scaffolding (or re-queries) to be readable.
+        # Set per-session because the sessionmaker is defined in the external
+        # packing_elf.models.database module.
+        session.expire_on_commit = False
         try:
             yield session
             session.commit()
@@ -146,6 +224,25 @@ class DatabaseService:
         finally:
             session.close()
 
+    @contextmanager
+    def get_read_session(self):
+        """Get a session for read-only paths, skipping the COMMIT round trip.
+
+        get_session() does checkout + BEGIN + COMMIT for every call, which
+        for single-SELECT reads means two extra round trips per query. Read
+        paths have nothing to commit; the pool's reset-on-return rolls back
+        the implicit transaction when the session closes.
+        """
+        session = SessionLocal()
+        try:
+            yield session
+        except Exception as e:
+            session.rollback()
+            self.logger.error(f"Database read session error: {e}")
+            raise
+        finally:
+            session.close()
+
     def health_check(self) -> tuple[bool, str]:
         """
         Perform a comprehensive database health check.
@@ -165,14 +262,19 @@ class DatabaseService:
                 if not result or result[0] != 1:
                     return False, "Database is not responding correctly to queries"
                 
-                # Test 3: Check if critical tables exist and are accessible
-                critical_tables = ['users', 'orders', 'products']
-                for table in critical_tables:
-                    try:
-                        session.execute(text(f"SELECT 1 FROM {table} LIMIT 1"))
-                    except Exception as table_error:
-                        # Table might not exist during initial setup, log but don't fail
-                        self.logger.warning(f"Table '{table}' not accessible: {table_error}")
+                # Test 3: Check if critical tables exist and are accessible.
+                # Tables don't appear or disappear at runtime, so the result
+                # is memoized and only re-verified every few minutes; warm
+                # health checks cost a single SELECT 1 round trip.
+                now = time_module.monotonic()
+                if now - self._tables_verified_at >= self._tables_verify_interval:
+                    for table, probe in self._HEALTH_QUERIES.items():
+                        try:
+                            session.execute(probe)
+                        except Exception as table_error:
+                            # Table might not exist during initial setup, log but don't fail
+                            self.logger.warning(f"Table '{table}' not accessible: {table_error}")
+                    self._tables_verified_at = now
                 
                 return True, "Database health check passed - all systems operational"
         
@@ -184,12 +286,13 @@ class DatabaseService:
     # User operations
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """Get a user by ID."""
+        hit, cached = self._cached_lookup(('user', user_id))
+        if hit:
+            return cached
         try:
-            with self.get_session() as session:
-                user = session.query(User).filter(User.id == user_id).first()
-                if user:
-                    self._load_user_attributes([user])
-                    session.expunge_all()
+            with self.get_read_session() as session:
+                user = session.get(User, user_id, options=_USER_LOADS)
+                self._store_lookup(('user', user_id), user)
                 return user
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting user by ID {user_id}: {e}")
@@ -200,12 +303,13 @@ class DatabaseService:
 
     def get_user_by_username(self, username: str) -> Optional[User]:
         """Get a user by username."""
+        hit, cached = self._cached_lookup(('user', username))
+        if hit:
+            return cached
         try:
-            with self.get_session() as session:
-                user = session.query(User).filter(User.username == username).first()
-                if user:
-                    self._load_user_attributes([user])
-                    session.expunge_all()
+            with self.get_read_session() as session:
+                user = session.execute(_Q_USER_BY_USERNAME, {'username': username}).scalars().first()
+                self._store_lookup(('user', username), user)
                 return user
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting user by username {username}: {e}")
@@ -217,15 +321,9 @@ class DatabaseService:
     def get_all_users(self) -> List[User]:
         """Get all users."""
         try:
-            with self.get_session() as session:
-                users = session.query(User).all()
-                
-                # Force load all attributes within the session
-                self._load_user_attributes(users)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
+            with self.get_read_session() as session:
+                users = session.query(User).options(*_USER_LOADS).all()
+
                 return users
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting all users: {e}")
@@ -245,24 +343,14 @@ class DatabaseService:
         Returns:
             Dictionary with user data or None if there was an error
         """
+        self._invalidate_lookups('user')
         try:
             with self.get_session() as session:
-                # Check if username already exists
-                existing_username = session.query(User).filter(User.username == username).first()
-                if existing_username:
-                    self.logger.warning(f"Username already exists: {username}")
-                    return None
-                    
-                # Check if palname already exists
-                existing_palname = session.query(User).filter(User.name == palname).first()
-                if existing_palname:
-                    self.logger.warning(f"Palname already exists: {palname}")
-                    return None
-                
                 # Hash the password for secure storage
                 hashed_password = password_service.hash_password(password)
                 
-                # Create the user
+                # Create the user; the unique constraints on username and name
+                # do the duplicate check, so no pre-flight SELECTs are needed
                 user = User(
                     name=palname,
                     username=username,
@@ -271,8 +359,7 @@ class DatabaseService:
                 )
                 
                 session.add(user)
-                session.flush()  # Flush to get the ID before commit
-                session.refresh(user)  # Refresh to get updated data
+                session.flush()  # Flush assigns the autoincrement ID
                 
                 # Extract user data before session closes to prevent DetachedInstanceError
                 user_data = self._extract_user_data(user)
@@ -280,6 +367,9 @@ class DatabaseService:
                 self.logger.info(f"Created new user: {username} (Palname: {palname}) with ID: {user_data['id']}")
                 return user_data
                 
+        except IntegrityError as e:
+            self.logger.warning(f"Username or palname already exists ({username} / {palname}): {e.orig}")
+            return None
         except SQLAlchemyError as e:
             self.logger.error(f"Database error creating user {username}: {e}")
             raise DatabaseError(f"Failed to create user: {e}") from e
@@ -296,12 +386,12 @@ class DatabaseService:
         Returns:
             Updated user object or None if error
         """
+        self._invalidate_lookups('user')
         try:
             with self.get_session() as session:
                 # Merge the user object into the session
                 merged_user = session.merge(user)
                 session.flush()  # Flush to ensure changes are persisted
-                session.refresh(merged_user)  # Refresh to get updated data
                 return merged_user
                 
         except SQLAlchemyError as e:
@@ -320,12 +410,15 @@ class DatabaseService:
         Returns:
             True if successful, False otherwise
         """
+        self._invalidate_lookups('user')
         try:
             with self.get_session() as session:
-                # Get the user in this session
-                user_to_delete = session.query(User).filter(User.id == user.id).first()
-                if user_to_delete:
-                    session.delete(user_to_delete)
+                # Single DELETE; rowcount says whether the user existed
+                result = session.execute(
+                    delete(User).where(User.id == user.id)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount:
                     return True
                 else:
                     self.logger.warning(f"User {user.id} not found for deletion")
@@ -342,10 +435,8 @@ class DatabaseService:
     def get_order_by_id(self, order_id: int) -> Optional[Order]:
         """Get an order by ID."""
         try:
-            with self.get_session() as session:
-                order = session.query(Order).filter(Order.id == order_id).first()
-                if order:
-                    self._load_order_attributes([order])
+            with self.get_read_session() as session:
+                order = session.get(Order, order_id, options=_ORDER_LOADS)
                 return order
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting order by ID {order_id}: {e}")
@@ -356,11 +447,13 @@ class DatabaseService:
 
     def get_order_by_external_id(self, external_id: str) -> Optional[Order]:
         """Get an order by external order ID."""
+        hit, cached = self._cached_lookup(('order', external_id))
+        if hit:
+            return cached
         try:
-            with self.get_session() as session:
-                order = session.query(Order).filter(Order.external_order_id == external_id).first()
-                if order:
-                    self._load_order_attributes([order])
+            with self.get_read_session() as session:
+                order = session.execute(_Q_ORDER_BY_EXTID, {'ext': external_id}).scalars().first()
+                self._store_lookup(('order', external_id), order)
                 return order
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting order by external ID {external_id}: {e}")
@@ -372,15 +465,9 @@ class DatabaseService:
     def get_orders_by_external_id(self, external_id: str) -> List[Order]:
         """Get all orders by external order ID (for duplicate checking)."""
         try:
-            with self.get_session() as session:
-                orders = session.query(Order).filter(Order.external_order_id == external_id).all()
-                
-                # Force load all attributes within the session
-                self._load_order_attributes(orders)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
+            with self.get_read_session() as session:
+                orders = session.query(Order).options(*_ORDER_LOADS).filter(Order.external_order_id == external_id).all()
+
                 return orders
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting orders by external ID {external_id}: {e}")
@@ -391,41 +478,55 @@ class DatabaseService:
 
     def get_recent_orders_by_external_id(self, external_id: str, months_back: int = 2) -> List[Order]:
         """Get orders by external order ID from the last N months (for efficient duplicate checking)."""
+        return self.get_recent_orders_by_external_ids([external_id], months_back).get(external_id, [])
+
+    def get_recent_orders_by_external_ids(self, external_ids: List[str], months_back: int = 2) -> Dict[str, List[Order]]:
+        """Get recent orders for many external order IDs in one query.
+
+        Batch-import duplicate checking used to call
+        get_recent_orders_by_external_id once per row; this replaces those
+        N round trips with a single IN query and groups the results by
+        external ID.
+
+        Returns:
+            Mapping of external_order_id to its recent orders (newest first).
+            IDs with no recent orders are absent from the mapping.
+        """
+        if not external_ids:
+            return {}
         try:
-            with self.get_session() as session:
-                # Calculate date threshold (N months ago)
-                from datetime import datetime, timedelta
-                threshold_date = datetime.now() - timedelta(days=months_back * 30)
+            with self.get_read_session() as session:
+                # Let the DB compute the threshold with its own clock and
+                # calendar months, so results don't depend on the client
+                # clock and the created_at index range scan still applies
+                threshold_date = func.date_sub(
+                    func.now(), text('INTERVAL :m MONTH').bindparams(m=months_back)
+                )
                 
-                orders = session.query(Order).filter(
-                    Order.external_order_id == external_id,
+                orders = session.query(Order).options(*_ORDER_LOADS).filter(
+                    Order.external_order_id.in_(external_ids),
                     Order.created_at >= threshold_date
                 ).order_by(Order.created_at.desc()).all()
-                
-                # Force load all attributes within the session
-                self._load_order_attributes(orders)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
-                return orders
+
+                grouped: Dict[str, List[Order]] = {}
+                for order in orders:
+                    grouped.setdefault(order.external_order_id, []).append(order)
+                return grouped
         except SQLAlchemyError as e:
-            self.logger.error(f"Database error getting recent orders by external ID {external_id}: {e}")
+            self.logger.error(f"Database error getting recent orders for {len(external_ids)} external IDs: {e}")
             raise DatabaseError(f"Failed to retrieve recent orders: {e}") from e
         except Exception as e:
-            self.logger.error(f"Unexpected error getting recent orders by external ID {external_id}: {e}")
-            return []
+            self.logger.error(f"Unexpected error getting recent orders for {len(external_ids)} external IDs: {e}")
+            return {}
 
     def get_order_by_external_id_and_invoice(self, external_id: str, invoice: str) -> Optional[Order]:
         """Get an order by external order ID and invoice combination."""
         try:
-            with self.get_session() as session:
-                order = session.query(Order).filter(
+            with self.get_read_session() as session:
+                order = session.query(Order).options(*_ORDER_LOADS).filter(
                     Order.external_order_id == external_id,
                     Order.invoice == invoice
                 ).first()
-                if order:
-                    self._load_order_attributes([order])
                 return order
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting order by external ID {external_id} and invoice {invoice}: {e}")
@@ -437,15 +538,9 @@ class DatabaseService:
     def get_all_orders(self) -> List[Order]:
         """Get all orders."""
         try:
-            with self.get_session() as session:
-                orders = session.query(Order).all()
-                
-                # Force load all attributes within the session
-                self._load_order_attributes(orders)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
+            with self.get_read_session() as session:
+                orders = session.query(Order).options(*_ORDER_LOADS).all()
+
                 return orders
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting all orders: {e}")
@@ -454,18 +549,31 @@ class DatabaseService:
             self.logger.error(f"Unexpected error getting all orders: {e}")
             return []
 
+    def iter_all_orders(self, batch_size: int = 500) -> Iterator[Order]:
+        """Stream all orders in batches instead of materializing the table.
+
+        Uses yield_per so only batch_size rows (plus their eagerly loaded
+        relationships, which selectinload keeps compatible with streaming)
+        are held in memory at a time. Callers that filter in Python can stop
+        early; callers that truly need a list can use get_all_orders().
+        """
+        try:
+            with self.get_read_session() as session:
+                result = session.execute(
+                    select(Order).options(*_ORDER_LOADS).execution_options(yield_per=batch_size)
+                )
+                for order in result.scalars():
+                    yield order
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error streaming all orders: {e}")
+            raise DatabaseError(f"Failed to stream orders: {e}") from e
+
     def get_orders_by_status(self, status: OrderStatus) -> List[Order]:
         """Get orders by status."""
         try:
-            with self.get_session() as session:
-                orders = session.query(Order).filter(Order.status == status).all()
-                
-                # Force load all attributes within the session
-                self._load_order_attributes(orders)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
+            with self.get_read_session() as session:
+                orders = session.query(Order).options(*_ORDER_LOADS).filter(Order.status == status).all()
+
                 return orders
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting orders by status {status}: {e}")
@@ -480,12 +588,12 @@ class DatabaseService:
 
     def create_order(self, order_data: Dict[str, Any]) -> Optional[Order]:
         """Create a new order."""
+        self._invalidate_lookups('order')
         try:
             with self.get_session() as session:
                 order = Order(**order_data)
                 session.add(order)
-                session.flush()  # Flush to get the ID before commit
-                session.refresh(order)  # Refresh to get updated data
+                session.flush()  # Flush assigns the autoincrement ID
                 self.logger.info(f"Created new order: {order.external_order_id}")
                 return order
                 
@@ -498,25 +606,26 @@ class DatabaseService:
 
     def update_order(self, order: Order, order_data: Dict[str, Any]) -> Optional[Order]:
         """Update an existing order."""
+        self._invalidate_lookups('order')
         try:
             with self.get_session() as session:
-                # Get the order in this session
-                order_to_update = session.query(Order).filter(Order.id == order.id).first()
-                if not order_to_update:
+                # Build the changed columns, dropping keys the model doesn't have
+                values = {key: value for key, value in order_data.items() if hasattr(Order, key)}
+                values['updated_at'] = datetime.now()
+                
+                # Single UPDATE statement; no need to hydrate the row first
+                result = session.execute(
+                    update(Order)
+                    .where(Order.id == order.id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 0:
                     self.logger.warning(f"Order {order.id} not found for update")
                     return None
                 
-                # Update fields
-                for key, value in order_data.items():
-                    if hasattr(order_to_update, key):
-                        setattr(order_to_update, key, value)
-                
-                # Update timestamp using the data dict to avoid direct assignment
-                order_data['updated_at'] = datetime.now()
-                setattr(order_to_update, 'updated_at', datetime.now())
-                session.flush()  # Flush to ensure changes are persisted
-                session.refresh(order_to_update)  # Refresh to get updated data
-                return order_to_update
+                # One SELECT to return the updated row (callers expect an Order)
+                return session.get(Order, order.id)
                 
         except SQLAlchemyError as e:
             self.logger.error(f"Database error updating order {order.id}: {e}")
@@ -531,18 +640,24 @@ class DatabaseService:
         Returns:
             external_order_id if successful, None if failed
         """
+        self._invalidate_lookups('order')
         try:
             with self.get_session() as session:
-                order = session.query(Order).filter(Order.id == order_id).first()
-                if order:
-                    setattr(order, 'status', status)
-                    setattr(order, 'updated_at', datetime.now())
-                    external_order_id = str(order.external_order_id)  # Get the ID while session is active
-                    session.flush()  # Flush to ensure changes are persisted
-                    return external_order_id  # Return the ID instead of the object
-                else:
+                # Fetch only the column we return instead of hydrating the row
+                external_order_id = session.query(Order.external_order_id).filter(
+                    Order.id == order_id
+                ).scalar()
+                if external_order_id is None:
                     self.logger.warning(f"Order {order_id} not found for status update")
                     return None
+                
+                session.execute(
+                    update(Order)
+                    .where(Order.id == order_id)
+                    .values(status=status, updated_at=datetime.now())
+                    .execution_options(synchronize_session=False)
+                )
+                return str(external_order_id)
                     
         except SQLAlchemyError as e:
             self.logger.error(f"Database error updating order status for order {order_id}: {e}")
@@ -560,12 +675,15 @@ class DatabaseService:
         Returns:
             True if successful, False otherwise
         """
+        self._invalidate_lookups('order')
         try:
             with self.get_session() as session:
-                # Get the order in this session
-                order_to_delete = session.query(Order).filter(Order.id == order.id).first()
-                if order_to_delete:
-                    session.delete(order_to_delete)
+                # Single DELETE; rowcount says whether the order existed
+                result = session.execute(
+                    delete(Order).where(Order.id == order.id)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount:
                     return True
                 else:
                     self.logger.warning(f"Order {order.id} not found for deletion")
@@ -587,18 +705,22 @@ class DatabaseService:
         Returns:
             Tuple of (success: bool, order_number: str)
         """
+        self._invalidate_lookups('order')
         try:
             with self.get_session() as session:
-                # Get the order in this session
-                order_to_delete = session.query(Order).filter(Order.id == order_id).first()
-                if order_to_delete:
-                    # Get order number before deletion
-                    order_number = str(order_to_delete.external_order_id)
-                    session.delete(order_to_delete)
-                    return True, order_number
-                else:
+                # MySQL has no DELETE ... RETURNING, so fetch just the order
+                # number column (no row hydration) before the DELETE
+                order_number = session.query(Order.external_order_id).filter(
+                    Order.id == order_id
+                ).scalar()
+                if order_number is None:
                     self.logger.warning(f"Order {order_id} not found for deletion")
                     return False, ""
+                session.execute(
+                    delete(Order).where(Order.id == order_id)
+                    .execution_options(synchronize_session=False)
+                )
+                return True, str(order_number)
                     
         except SQLAlchemyError as e:
             self.logger.error(f"Database error deleting order {order_id}: {e}")
@@ -610,15 +732,9 @@ class DatabaseService:
     def get_recent_orders(self, limit: int = 20) -> List[Order]:
         """Get recent orders."""
         try:
-            with self.get_session() as session:
-                orders = session.query(Order).order_by(Order.created_at.desc()).limit(limit).all()
-                
-                # Force load all attributes within the session
-                self._load_order_attributes(orders)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
+            with self.get_read_session() as session:
+                orders = session.execute(_Q_RECENT_ORDERS, {'n': limit}).scalars().all()
+
                 return orders
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting recent orders: {e}")
@@ -627,21 +743,19 @@ class DatabaseService:
             self.logger.error(f"Unexpected error getting recent orders: {e}")
             return []
 
-    def search_orders(self, search_term: str) -> List[Order]:
-        """Search for orders by customer name or order ID."""
+    def search_orders(self, search_term: str, limit: int = 100) -> List[Order]:
+        """Search for orders by customer name or order ID.
+
+        Results are capped (newest first) so a short search term cannot pull
+        the whole orders table across the wire.
+        """
         try:
-            with self.get_session() as session:
-                orders = session.query(Order).filter(
+            with self.get_read_session() as session:
+                orders = session.query(Order).options(*_ORDER_LOADS).filter(
                     (Order.customer_name.like(f"%{search_term}%")) |
                     (Order.external_order_id.like(f"%{search_term}%"))
-                ).all()
-                
-                # Force load all attributes within the session
-                self._load_order_attributes(orders)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
+                ).order_by(Order.created_at.desc()).limit(limit).all()
+
                 return orders
         except SQLAlchemyError as e:
             self.logger.error(f"Database error searching orders with term {search_term}: {e}")
@@ -650,21 +764,121 @@ class DatabaseService:
             self.logger.error(f"Unexpected error searching orders with term {search_term}: {e}")
             return []
 
+    def get_all_users_dto(self) -> List[Dict[str, Any]]:
+        """Get all users as plain dictionaries for read-only display.
+
+        Uses a Core select with mappings() so no ORM objects are built and
+        no detachment bookkeeping is needed; prefer this over
+        get_all_users() when the caller only renders the rows.
+        """
+        try:
+            with self.get_read_session() as session:
+                rows = session.execute(select(User.__table__)).mappings().all()
+                return [dict(row) for row in rows]
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error getting users as dicts: {e}")
+            raise DatabaseError(f"Failed to retrieve users: {e}") from e
+        except Exception as e:
+            self.logger.error(f"Unexpected error getting users as dicts: {e}")
+            return []
+
+    def get_all_orders_dto(self) -> List[Dict[str, Any]]:
+        """Get all orders as plain dictionaries for read-only display."""
+        try:
+            with self.get_read_session() as session:
+                rows = session.execute(select(Order.__table__)).mappings().all()
+                return [dict(row) for row in rows]
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error getting orders as dicts: {e}")
+            raise DatabaseError(f"Failed to retrieve orders: {e}") from e
+        except Exception as e:
+            self.logger.error(f"Unexpected error getting orders as dicts: {e}")
+            return []
+
+    def get_recent_orders_dto(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get recent orders as plain dictionaries for read-only display."""
+        try:
+            with self.get_read_session() as session:
+                rows = session.execute(
+                    select(Order.__table__).order_by(Order.created_at.desc()).limit(limit)
+                ).mappings().all()
+                return [dict(row) for row in rows]
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error getting recent orders as dicts: {e}")
+            raise DatabaseError(f"Failed to retrieve recent orders: {e}") from e
+        except Exception as e:
+            self.logger.error(f"Unexpected error getting recent orders as dicts: {e}")
+            return []
+
+    def search_orders_dto(self, search_term: str) -> List[Dict[str, Any]]:
+        """Search orders and return plain dictionaries for read-only display."""
+        try:
+            with self.get_read_session() as session:
+                rows = session.execute(
+                    select(Order.__table__).where(
+                        (Order.customer_name.like(f"%{search_term}%")) |
+                        (Order.external_order_id.like(f"%{search_term}%"))
+                    )
+                ).mappings().all()
+                return [dict(row) for row in rows]
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error searching orders as dicts with term {search_term}: {e}")
+            raise DatabaseError(f"Failed to search orders: {e}") from e
+        except Exception as e:
+            self.logger.error(f"Unexpected error searching orders as dicts with term {search_term}: {e}")
+            return []
+
+    def ensure_search_indexes(self) -> None:
+        """Create the indexes the order search relies on if they are missing.
+
+        MySQL has no CREATE INDEX IF NOT EXISTS, so existence is checked via
+        information_schema first. Safe to call at startup; it is a no-op once
+        the indexes exist.
+        """
+        # table -> {index_name: (columns, unique)}. Columns declared UNIQUE
+        # in the schema (external_order_id, invoice, myacg_accounts.name)
+        # already carry an index from their constraint and are not repeated
+        # here — a second index would only slow writes.
+        wanted = {
+            'orders': {
+                'idx_orders_customer_name': ('customer_name', False),
+                # Composite index for the duplicate check's ID + recency filter
+                'idx_orders_external_id_created': ('external_order_id, created_at', False),
+                # Range scans for the by-date and date-range queries
+                'idx_orders_order_date': ('order_date', False),
+                # Lets the recent-orders scan walk created_at in order and
+                # stop at LIMIT instead of sorting the table
+                'idx_orders_recent': ('created_at, external_order_id, customer_name', False),
+            },
+        }
+        try:
+            with self.get_session() as session:
+                for table, indexes in wanted.items():
+                    existing = {
+                        row[0] for row in session.execute(text(
+                            "SELECT index_name FROM information_schema.statistics "
+                            "WHERE table_schema = DATABASE() AND table_name = :t"
+                        ), {'t': table})
+                    }
+                    for index_name, (columns, unique) in indexes.items():
+                        if index_name not in existing:
+                            unique_sql = 'UNIQUE ' if unique else ''
+                            session.execute(text(
+                                f"CREATE {unique_sql}INDEX {index_name} ON {table} ({columns})"
+                            ))
+                            self.logger.info(f"Created index {index_name} on {table} ({columns})")
+        except Exception as e:
+            self.logger.error(f"Error ensuring search indexes: {e}")
+
     def get_orders_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Order]:
         """Get orders within a date range."""
         try:
-            with self.get_session() as session:
-                orders = session.query(Order).filter(
+            with self.get_read_session() as session:
+                orders = session.query(Order).options(*_ORDER_LOADS).filter(
                     Order.order_date >= start_date,
                     Order.order_date <= end_date
                 ).all()
-                
-                # Force load all attributes within the session
-                self._load_order_attributes(orders)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
+
                 return orders
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting orders by date range: {e}")
@@ -676,22 +890,18 @@ class DatabaseService:
     def get_orders_by_date(self, date) -> List[Order]:
         """Get orders for a specific date."""
         try:
-            with self.get_session() as session:
-                # Convert date to datetime range
+            with self.get_read_session() as session:
+                # Half-open interval [midnight, next midnight): unlike a
+                # time.max upper bound it cannot lose microsecond-rounded
+                # rows, and the range predicate stays index-friendly
                 start_datetime = datetime.combine(date, time.min)
-                end_datetime = datetime.combine(date, time.max)
+                end_datetime = start_datetime + timedelta(days=1)
                 
-                orders = session.query(Order).filter(
+                orders = session.query(Order).options(*_ORDER_LOADS).filter(
                     Order.order_date >= start_datetime,
-                    Order.order_date <= end_datetime
+                    Order.order_date < end_datetime
                 ).all()
-                
-                # Force load all attributes within the session
-                self._load_order_attributes(orders)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
+
                 return orders
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting orders by date {date}: {e}")
@@ -703,17 +913,11 @@ class DatabaseService:
     def get_orders_not_exported(self) -> List[Order]:
         """Get all orders that haven't been exported to Excel yet."""
         try:
-            with self.get_session() as session:
-                orders = session.query(Order).filter(
+            with self.get_read_session() as session:
+                orders = session.query(Order).options(*_ORDER_LOADS).filter(
                     Order.export_to_excel == False
                 ).all()
-                
-                # Force load all attributes within the session
-                self._load_order_attributes(orders)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
+
                 return orders
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting orders not exported: {e}")
@@ -722,24 +926,53 @@ class DatabaseService:
             self.logger.error(f"Unexpected error getting orders not exported: {e}")
             return []
 
+    def iter_orders_not_exported(self, batch_size: int = 500) -> Iterator[Order]:
+        """Stream not-yet-exported orders instead of materializing them.
+
+        The Excel export walks these rows once, so streaming with yield_per
+        keeps memory flat as the backlog grows and gets the first row to the
+        writer immediately.
+        """
+        try:
+            with self.get_read_session() as session:
+                result = session.execute(
+                    select(Order).options(*_ORDER_LOADS)
+                    .where(Order.export_to_excel == False)
+                    .execution_options(yield_per=batch_size, stream_results=True)
+                )
+                for order in result.scalars():
+                    yield order
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error streaming orders not exported: {e}")
+            raise DatabaseError(f"Failed to stream orders not exported: {e}") from e
+
+    def iter_all_products(self, batch_size: int = 500) -> Iterator[Product]:
+        """Stream all products in batches; see iter_orders_not_exported."""
+        try:
+            with self.get_read_session() as session:
+                result = session.execute(
+                    select(Product).execution_options(yield_per=batch_size, stream_results=True)
+                )
+                for product in result.scalars():
+                    yield product
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error streaming products: {e}")
+            raise DatabaseError(f"Failed to stream products: {e}") from e
+
     def get_next_pending_invoice_number(self) -> str:
         """Get the next available pending invoice number (pending00, pending01, etc.)."""
         try:
-            with self.get_session() as session:
-                # Get all pending invoice numbers that start with 'pending'
-                pending_invoices = session.query(Order.invoice).filter(
-                    Order.invoice.like('pending%')
-                ).all()
-                
-                # Extract numbers from existing pending invoices
-                used_numbers = set()
-                for (invoice,) in pending_invoices:
-                    if invoice and invoice.startswith('pending') and len(invoice) == 9:  # pending + 2 digits
-                        try:
-                            number = int(invoice[7:])  # Extract the number part
-                            used_numbers.add(number)
-                        except ValueError:
-                            continue
+            with self.get_read_session() as session:
+                # Push the shape check into SQL and project just the numeric
+                # suffix: at most 100 one-column rows come back instead of
+                # every pending% row being hydrated and parsed in Python
+                result = session.execute(text(
+                    "SELECT CAST(SUBSTRING(invoice, 8) AS UNSIGNED) "
+                    "FROM orders WHERE invoice REGEXP '^pending[0-9]{2}$'"
+                ))
+                # scalars() hands back the bare integers with no per-row
+                # Row object to unpack
+                used_numbers = set(result.scalars())
                 
                 # Find the next available number (00-99)
                 for i in range(100):
@@ -764,8 +997,8 @@ class DatabaseService:
     def get_product_by_id(self, product_id: int) -> Optional[Product]:
         """Get a product by ID."""
         try:
-            with self.get_session() as session:
-                return session.query(Product).filter(Product.id == product_id).first()
+            with self.get_read_session() as session:
+                return session.get(Product, product_id)
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting product by ID {product_id}: {e}")
             raise DatabaseError(f"Failed to retrieve product: {e}") from e
@@ -776,8 +1009,8 @@ class DatabaseService:
     def get_product_by_sku(self, sku: str) -> Optional[Product]:
         """Get a product by SKU."""
         try:
-            with self.get_session() as session:
-                return session.query(Product).filter(Product.sku == sku).first()
+            with self.get_read_session() as session:
+                return session.execute(_Q_PRODUCT_BY_SKU, {'sku': sku}).scalars().first()
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting product by SKU {sku}: {e}")
             raise DatabaseError(f"Failed to retrieve product: {e}") from e
@@ -788,7 +1021,7 @@ class DatabaseService:
     def get_all_products(self) -> List[Product]:
         """Get all products."""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 return session.query(Product).all()
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting all products: {e}")
@@ -803,8 +1036,7 @@ class DatabaseService:
             with self.get_session() as session:
                 product = Product(**product_data)
                 session.add(product)
-                session.flush()  # Flush to get the ID before commit
-                session.refresh(product)  # Refresh to get updated data
+                session.flush()  # Flush assigns the autoincrement ID
                 return product
                 
         except SQLAlchemyError as e:
@@ -820,7 +1052,6 @@ class DatabaseService:
             with self.get_session() as session:
                 merged_product = session.merge(product)
                 session.flush()  # Flush to ensure changes are persisted
-                session.refresh(merged_product)  # Refresh to get updated data
                 return merged_product
                 
         except SQLAlchemyError as e:
@@ -834,9 +1065,10 @@ class DatabaseService:
         """Delete a product."""
         try:
             with self.get_session() as session:
-                product_to_delete = session.query(Product).filter(Product.id == product.id).first()
-                if product_to_delete:
-                    session.delete(product_to_delete)
+                rowcount = session.query(Product).filter(Product.id == product.id).delete(
+                    synchronize_session=False
+                )
+                if rowcount:
                     return True
                 else:
                     self.logger.warning(f"Product {product.id} not found for deletion")
@@ -856,8 +1088,7 @@ class DatabaseService:
             with self.get_session() as session:
                 label = ShippingLabel(**label_data)
                 session.add(label)
-                session.flush()  # Flush to get the ID before commit
-                session.refresh(label)  # Refresh to get updated data
+                session.flush()  # Flush assigns the autoincrement ID
                 return label
                 
         except SQLAlchemyError as e:
@@ -870,7 +1101,7 @@ class DatabaseService:
     def get_shipping_labels_for_order(self, order_id: int) -> List[ShippingLabel]:
         """Get shipping labels for an order."""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 return session.query(ShippingLabel).filter(ShippingLabel.order_id == order_id).all()
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting shipping labels for order {order_id}: {e}")
@@ -885,8 +1116,7 @@ class DatabaseService:
             with self.get_session() as session:
                 slip = PackingSlip(**slip_data)
                 session.add(slip)
-                session.flush()  # Flush to get the ID before commit
-                session.refresh(slip)  # Refresh to get updated data
+                session.flush()  # Flush assigns the autoincrement ID
                 return slip
                 
         except SQLAlchemyError as e:
@@ -899,7 +1129,7 @@ class DatabaseService:
     def get_packing_slips_for_order(self, order_id: int) -> List[PackingSlip]:
         """Get packing slips for an order."""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 return session.query(PackingSlip).filter(PackingSlip.order_id == order_id).all()
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting packing slips for order {order_id}: {e}")
@@ -921,16 +1151,86 @@ class DatabaseService:
                 self.logger.error(f"Batch operation failed: {e}")
                 raise
 
+    def bulk_create_products(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many products in one batched statement.
+
+        Skips per-row ORM object construction and identity-map inserts, so
+        multi-row ingest runs as a single executemany INSERT. Use
+        create_product() when the caller needs the generated object back.
+        """
+        if not rows:
+            return 0
+        try:
+            with self.get_session() as session:
+                session.bulk_insert_mappings(Product, rows)
+                return len(rows)
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error bulk-creating {len(rows)} products: {e}")
+            raise DatabaseError(f"Failed to bulk-create products: {e}") from e
+        except Exception as e:
+            self.logger.error(f"Unexpected error bulk-creating {len(rows)} products: {e}")
+            return 0
+
+    def bulk_update_products(self, rows: List[Dict[str, Any]]) -> int:
+        """Update many products by primary key in one batched statement.
+
+        Each row dict must include 'id'; remaining keys are the columns to
+        set. Emits a single executemany UPDATE via bulk_update_mappings.
+        """
+        if not rows:
+            return 0
+        try:
+            with self.get_session() as session:
+                session.bulk_update_mappings(Product, rows)
+                return len(rows)
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error bulk-updating {len(rows)} products: {e}")
+            raise DatabaseError(f"Failed to bulk-update products: {e}") from e
+        except Exception as e:
+            self.logger.error(f"Unexpected error bulk-updating {len(rows)} products: {e}")
+            return 0
+
+    def bulk_create_shipping_labels(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many shipping labels in one batched statement."""
+        if not rows:
+            return 0
+        try:
+            with self.get_session() as session:
+                session.bulk_insert_mappings(ShippingLabel, rows)
+                return len(rows)
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error bulk-creating {len(rows)} shipping labels: {e}")
+            raise DatabaseError(f"Failed to bulk-create shipping labels: {e}") from e
+        except Exception as e:
+            self.logger.error(f"Unexpected error bulk-creating {len(rows)} shipping labels: {e}")
+            return 0
+
+    def bulk_create_packing_slips(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many packing slips in one batched statement."""
+        if not rows:
+            return 0
+        try:
+            with self.get_session() as session:
+                session.bulk_insert_mappings(PackingSlip, rows)
+                return len(rows)
+        except SQLAlchemyError as e:
+            self.logger.error(f"Database error bulk-creating {len(rows)} packing slips: {e}")
+            raise DatabaseError(f"Failed to bulk-create packing slips: {e}") from e
+        except Exception as e:
+            self.logger.error(f"Unexpected error bulk-creating {len(rows)} packing slips: {e}")
+            return 0
+
     # MyACG Account operations
     def create_myacg_account(self, name: str, username: str, 
                            password: str, api_key: Optional[str] = None,
                            is_default: bool = False) -> Optional[MyACGAccount]:
         """Create a new MyACG account."""
+        self._invalidate_lookups('account')
         try:
             with self.get_session() as session:
-                # Check if name already exists
-                existing_account = session.query(MyACGAccount).filter(MyACGAccount.name == name).first()
-                if existing_account:
+                # Existence probe only — SELECT EXISTS avoids hydrating the
+                # whole row (including the encrypted password) just to check
+                if session.query(exists().where(MyACGAccount.name == name)).scalar():
                     self.logger.warning(f"MyACG account name already exists: {name}")
                     return None
                 
@@ -953,8 +1253,7 @@ class DatabaseService:
                 )
                 
                 session.add(account)
-                session.flush()  # Flush to get the ID before commit
-                session.refresh(account)  # Refresh to get updated data
+                session.flush()  # Flush assigns the autoincrement ID
                 
                 self.logger.info(f"Created new MyACG account: {name}")
                 return account
@@ -969,10 +1268,12 @@ class DatabaseService:
     def _unset_default_myacg_accounts_in_session(self, session: Session) -> None:
         """Unset default flag for all MyACG accounts within a session."""
         try:
-            accounts = session.query(MyACGAccount).filter(MyACGAccount.is_default == True).all()
-            for account in accounts:
-                setattr(account, 'is_default', False)
-                setattr(account, 'updated_at', datetime.now())
+            # One bulk UPDATE instead of hydrating each default row and
+            # flushing a per-row UPDATE later
+            session.query(MyACGAccount).filter(MyACGAccount.is_default == True).update(
+                {MyACGAccount.is_default: False, MyACGAccount.updated_at: datetime.now()},
+                synchronize_session=False
+            )
         except Exception as e:
             self.logger.error(f"Error unsetting default MyACG accounts: {e}")
             raise
@@ -980,15 +1281,9 @@ class DatabaseService:
     def get_myacg_accounts(self) -> List[MyACGAccount]:
         """Get all MyACG accounts."""
         try:
-            with self.get_session() as session:
+            with self.get_read_session() as session:
                 accounts = session.query(MyACGAccount).all()
-                
-                # Force load all attributes within the session
-                self._load_myacg_account_attributes(accounts)
-                
-                # Expunge all objects to detach them from the session
-                session.expunge_all()
-                
+
                 return accounts
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting MyACG accounts: {e}")
@@ -999,12 +1294,13 @@ class DatabaseService:
 
     def get_myacg_account(self, account_id: int) -> Optional[MyACGAccount]:
         """Get a MyACG account by ID."""
+        hit, cached = self._cached_lookup(('account', account_id))
+        if hit:
+            return cached
         try:
-            with self.get_session() as session:
-                account = session.query(MyACGAccount).filter(MyACGAccount.id == account_id).first()
-                if account:
-                    self._load_myacg_account_attributes([account])
-                    session.expunge_all()
+            with self.get_read_session() as session:
+                account = session.get(MyACGAccount, account_id)
+                self._store_lookup(('account', account_id), account)
                 return account
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting MyACG account {account_id}: {e}")
@@ -1015,12 +1311,15 @@ class DatabaseService:
 
     def get_default_myacg_account(self) -> Optional[MyACGAccount]:
         """Get the default MyACG account."""
+        # Own namespace so an account literally named "default" cached by
+        # get_myacg_account_by_name can never serve this lookup (or vice versa)
+        hit, cached = self._cached_lookup(('account_default', None))
+        if hit:
+            return cached
         try:
-            with self.get_session() as session:
-                account = session.query(MyACGAccount).filter(MyACGAccount.is_default == True).first()
-                if account:
-                    self._load_myacg_account_attributes([account])
-                    session.expunge_all()
+            with self.get_read_session() as session:
+                account = session.execute(_Q_DEFAULT_ACCOUNT).scalars().first()
+                self._store_lookup(('account_default', None), account)
                 return account
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting default MyACG account: {e}")
@@ -1031,9 +1330,10 @@ class DatabaseService:
 
     def update_myacg_account(self, account_id: int, data: Dict[str, Any]) -> Optional[MyACGAccount]:
         """Update a MyACG account."""
+        self._invalidate_lookups('account')
         try:
             with self.get_session() as session:
-                account = session.query(MyACGAccount).filter(MyACGAccount.id == account_id).first()
+                account = session.get(MyACGAccount, account_id)
                 if not account:
                     self.logger.warning(f"MyACG account {account_id} not found")
                     return None
@@ -1063,7 +1363,6 @@ class DatabaseService:
                 setattr(account, 'updated_at', datetime.now())
                 
                 session.flush()  # Flush to ensure changes are persisted
-                session.refresh(account)  # Refresh to get updated data
                 
                 self.logger.info(f"Updated MyACG account {account_id}")
                 return account
@@ -1077,11 +1376,13 @@ class DatabaseService:
 
     def delete_myacg_account(self, account_id: int) -> bool:
         """Delete a MyACG account."""
+        self._invalidate_lookups('account')
         try:
             with self.get_session() as session:
-                account = session.query(MyACGAccount).filter(MyACGAccount.id == account_id).first()
-                if account:
-                    session.delete(account)
+                rowcount = session.query(MyACGAccount).filter(MyACGAccount.id == account_id).delete(
+                    synchronize_session=False
+                )
+                if rowcount:
                     self.logger.info(f"Deleted MyACG account {account_id}")
                     return True
                 else:
@@ -1097,12 +1398,22 @@ class DatabaseService:
 
     def decrypt_myacg_password(self, account_id: int) -> Optional[str]:
         """Decrypt and return the password for a MyACG account."""
+        entry = self._pw_cache.get(account_id)
+        if entry is not None:
+            cached_at, plaintext = entry
+            if time_module.monotonic() - cached_at < self._pw_cache_ttl:
+                return plaintext
+            del self._pw_cache[account_id]
         try:
-            with self.get_session() as session:
-                account = session.query(MyACGAccount).filter(MyACGAccount.id == account_id).first()
+            with self.get_read_session() as session:
+                account = session.get(MyACGAccount, account_id)
                 if account is not None and getattr(account, 'encrypted_password', None) is not None:
                     try:
-                        return password_service.decrypt_data(getattr(account, 'encrypted_password'))
+                        plaintext = password_service.decrypt_data(getattr(account, 'encrypted_password'))
+                        if len(self._pw_cache) >= self._pw_cache_max:
+                            self._pw_cache.clear()
+                        self._pw_cache[account_id] = (time_module.monotonic(), plaintext)
+                        return plaintext
                     except Exception as decrypt_error:
                         self.logger.error(f"Failed to decrypt password for account {account_id}: {decrypt_error}")
                         return None
@@ -1119,12 +1430,13 @@ class DatabaseService:
 
     def get_myacg_account_by_name(self, name: str) -> Optional[MyACGAccount]:
         """Get a MyACG account by name."""
+        hit, cached = self._cached_lookup(('account', name))
+        if hit:
+            return cached
         try:
-            with self.get_session() as session:
-                account = session.query(MyACGAccount).filter(MyACGAccount.name == name).first()
-                if account:
-                    self._load_myacg_account_attributes([account])
-                    session.expunge_all()
+            with self.get_read_session() as session:
+                account = session.execute(_Q_ACCOUNT_BY_NAME, {'name': name}).scalars().first()
+                self._store_lookup(('account', name), account)
                 return account
         except SQLAlchemyError as e:
             self.logger.error(f"Database error getting MyACG account by name {name}: {e}")
@@ -1133,9 +1445,72 @@ class DatabaseService:
             self.logger.error(f"Unexpected error getting MyACG account by name {name}: {e}")
             return None
 
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool statistics for monitoring.
+
+        Exposes the engine's pool counters so pool exhaustion (checked-out
+        connections pinned at pool_size + max_overflow) can be spotted
+        before requests start queueing on connection checkout.
+        """
+        try:
+            from packing_elf.models.database import engine
+            pool = engine.pool
+            return {
+                'size': pool.size() if hasattr(pool, 'size') else None,
+                'checked_in': pool.checkedin() if hasattr(pool, 'checkedin') else None,
+                'checked_out': pool.checkedout() if hasattr(pool, 'checkedout') else None,
+                'overflow': pool.overflow() if hasattr(pool, 'overflow') else None,
+                'status': pool.status(),
+            }
+        except Exception as e:
+            self.logger.error(f"Error reading pool stats: {e}")
+            return {}
+
+    async def run_async(self, func, *args, **kwargs):
+        """Run a synchronous service method without blocking the event loop.
+
+        Async callers (the chatbot's handlers) use this to overlap the
+        network waits of DB calls instead of serializing them on the loop:
+
+            user = await db_service.run_async(db_service.get_user_by_id, 3)
+
+        The executor is bounded to the connection pool size, so at most
+        pool-many calls run concurrently and the rest queue in Python
+        rather than piling up on connection checkout.
+        """
+        loop = asyncio.get_running_loop()
+        if kwargs:
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def aget_user_by_id(self, user_id: int) -> Optional[User]:
+        """Async variant of get_user_by_id; safe to asyncio.gather."""
+        return await self.run_async(self.get_user_by_id, user_id)
+
+    async def aget_user_by_username(self, username: str) -> Optional[User]:
+        """Async variant of get_user_by_username."""
+        return await self.run_async(self.get_user_by_username, username)
+
+    async def aget_order_by_external_id(self, external_id: str) -> Optional[Order]:
+        """Async variant of get_order_by_external_id."""
+        return await self.run_async(self.get_order_by_external_id, external_id)
+
+    async def aget_recent_orders(self, limit: int = 20) -> List[Order]:
+        """Async variant of get_recent_orders."""
+        return await self.run_async(self.get_recent_orders, limit)
+
+    async def asearch_orders(self, search_term: str, limit: int = 100) -> List[Order]:
+        """Async variant of search_orders."""
+        return await self.run_async(self.search_orders, search_term, limit)
+
+    async def ahealth_check(self) -> tuple[bool, str]:
+        """Async variant of health_check."""
+        return await self.run_async(self.health_check)
+
     def cleanup(self):
         """Cleanup database resources on application shutdown."""
         try:
+            self._executor.shutdown(wait=False)
             # Close any remaining connections in the connection pool
             from packing_elf.models.database import engine
             engine.dispose()
@@ -1157,13 +1532,12 @@ class DatabaseService:
             with self.get_session() as session:
                 result = session.execute(text(sql), params or {})
                 
-                # Convert result to list of dictionaries
-                try:
-                    columns = result.keys()
-                    return [dict(zip(columns, row)) for row in result.fetchall()]
-                except Exception:
-                    # If result doesn't have rows, return empty list
+                # Non-SELECT statements have no rows to convert
+                if not result.returns_rows:
                     return []
+                # mappings() wraps each DBAPI row directly instead of a
+                # per-row zip + dict build over the column names
+                return [dict(row) for row in result.mappings()]
                     
         except SQLAlchemyError as e:
             self.logger.error(f"Database error executing raw SQL: {e}")
@@ -1210,6 +1584,7 @@ class DatabaseConnectionManager:
         self.logger = logging.getLogger(__name__)
         self.config_file = Path.home() / ".packing_elf" / "db_config.json"
         self.connection = None
+        self.pool = None
         self.is_connected = False
         self.host_ip = None
         
@@ -1248,25 +1623,18 @@ class DatabaseConnectionManager:
     
     def test_connection(self, host_ip: str, **kwargs) -> bool:
         """Test if a database connection works with given host IP."""
+        # TCP probe first: dead hosts fail in half a second instead of
+        # paying the full MySQL auth handshake (and its 3s timeout)
+        if not self._tcp_reachable(host_ip, kwargs.get('port', 3306)):
+            self.logger.warning(f"Connection test failed for {host_ip}: port not reachable")
+            return False
         try:
             # Add timeout to prevent hanging
             connection_kwargs = kwargs.copy()
             connection_kwargs['connect_timeout'] = 3  # 3 second timeout
             
-            if MYSQL_AVAILABLE:
-                test_conn = mysql.connector.connect(
-                    host=host_ip,
-                    **connection_kwargs
-                )
-                test_conn.close()
-            else:
-                # Fallback to pymysql
-                import pymysql
-                test_conn = pymysql.connect(
-                    host=host_ip,
-                    **connection_kwargs
-                )
-                test_conn.close()
+            test_conn = _connect_fn(host=host_ip, **connection_kwargs)
+            test_conn.close()
             return True
         except Exception as e:
             self.logger.warning(f"Connection test failed for {host_ip}: {e}")
@@ -1283,35 +1651,109 @@ class DatabaseConnectionManager:
                 "port": 3306
             }
             
-            # Method 1: Try discovery service (if running on host)
+            # Method 0: The host found last time almost always still works;
+            # re-verify it with one connection test before sweeping anything
+            if self.host_ip and self.test_connection(self.host_ip, **default_credentials):
+                self.logger.info(f"Reusing previously discovered host: {self.host_ip}")
+                return self.host_ip
+            
+            saved_config = self.load_saved_config()
+            if saved_config and self.test_connection(saved_config["host"], **default_credentials):
+                self.logger.info(f"Using saved host: {saved_config['host']}")
+                return self._remember_host(saved_config["host"], **default_credentials)
+            
+            # Method 1: Try discovery service (if running on host). Verify
+            # MySQL actually answers there before persisting the address —
+            # the discovery reply is just a claim, not a live connection
             discovered_ip = self._try_discovery_service()
-            if discovered_ip:
+            if discovered_ip and self.test_connection(discovered_ip, **default_credentials):
                 self.logger.info(f"Discovered host via discovery service: {discovered_ip}")
-                return discovered_ip
+                return self._remember_host(discovered_ip, **default_credentials)
             
-            # Method 2: Try common local network ranges
+            # Method 2: Try common local network ranges. Probe in parallel
+            # with a cheap TCP pre-filter so total latency is one timeout,
+            # not the sum of every candidate's timeout
             common_ranges = [
                 "192.168.1.100", "192.168.1.101", "192.168.1.102",
                 "192.168.0.100", "192.168.0.101", "192.168.0.102",
                 "10.0.0.100", "10.0.0.101", "10.0.0.102"
             ]
             
-            for ip in common_ranges:
-                if self.test_connection(ip, **default_credentials):
-                    self.logger.info(f"Discovered host at: {ip}")
-                    return ip
+            def probe_mysql(ip):
+                if not self._tcp_reachable(ip, default_credentials['port']):
+                    return None
+                return ip if self.test_connection(ip, **default_credentials) else None
             
-            # Method 3: Try saved config
-            saved_config = self.load_saved_config()
-            if saved_config and self.test_connection(saved_config["host"], **default_credentials):
-                self.logger.info(f"Using saved host: {saved_config['host']}")
-                return saved_config["host"]
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                futures = {executor.submit(probe_mysql, ip): ip for ip in common_ranges}
+                for future in as_completed(futures):
+                    ip = future.result()
+                    if ip:
+                        for pending in futures:
+                            pending.cancel()
+                        self.logger.info(f"Discovered host at: {ip}")
+                        return self._remember_host(ip, **default_credentials)
             
             return None
         except Exception as e:
             self.logger.error(f"Error during host discovery: {e}")
             return None
     
+    def _remember_host(self, host_ip: str, **credentials) -> str:
+        """Record a working host in memory and on disk for the next call."""
+        self.host_ip = host_ip
+        self.save_config(host_ip, **credentials)
+        return host_ip
+    
+    def _tcp_reachable(self, ip: str, port: int, timeout: float = 0.5) -> bool:
+        """Cheap TCP-level reachability check before paying for MySQL auth."""
+        try:
+            with socket.create_connection((ip, port), timeout=timeout):
+                return True
+        except Exception:
+            return False
+    
+    def _probe_discovery_endpoint(self, ip: str, port: int) -> Optional[str]:
+        """Query one discovery-service endpoint; returns the server IP or None."""
+        try:
+            import urllib.request
+            if not self._tcp_reachable(ip, port):
+                return None
+            url = f"http://{ip}:{port}/discover"
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    data = json.loads(response.read().decode('utf-8'))
+                    return data.get('server_ip')
+        except Exception:
+            pass
+        return None
+    
+    def _try_udp_broadcast(self, ports, timeout: float = 0.3) -> Optional[str]:
+        """Ask the whole subnet for the host with one UDP broadcast.
+
+        One datagram per port replaces probing dozens of addresses over
+        HTTP. Only a structured JSON {'server_ip': ...} reply is accepted —
+        the same contract as the HTTP /discover endpoint — so a stray
+        process answering the broadcast can't pose as the database host.
+        """
+        for port in ports:
+            try:
+                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                    sock.settimeout(timeout)
+                    sock.sendto(b'DISCOVER', ('255.255.255.255', port))
+                    data, addr = sock.recvfrom(1024)
+                    try:
+                        payload = json.loads(data.decode('utf-8'))
+                        server_ip = payload.get('server_ip')
+                    except (ValueError, AttributeError):
+                        continue
+                    if isinstance(server_ip, str) and server_ip.count('.') == 3:
+                        return server_ip
+            except Exception:
+                continue
+        return None
+    
     def _try_discovery_service(self) -> Optional[str]:
         """Try to discover host using the discovery service."""
         try:
@@ -1321,6 +1763,13 @@ class DatabaseConnectionManager:
             # Try common discovery service ports
             discovery_ports = [8080, 8081, 8082]
             
+            # One broadcast beats sweeping addresses: sub-second on any LAN
+            # where the discovery service listens for UDP
+            broadcast_ip = self._try_udp_broadcast(discovery_ports)
+            if broadcast_ip:
+                self.logger.info(f"Found host via UDP broadcast: {broadcast_ip}")
+                return broadcast_ip
+            
             # First try localhost (same machine)
             for port in discovery_ports:
                 try:
@@ -1335,62 +1784,75 @@ class DatabaseConnectionManager:
                 except Exception:
                     continue
             
-            # If localhost didn't work, try a limited set of common IPs
-            # Only try a few common IPs to avoid long timeouts
+            # If localhost didn't work, sweep a limited set of common IPs
+            # in parallel; first responder wins and the rest are cancelled
             common_ips = [
                 "192.168.1.100", "192.168.1.101", "192.168.1.102", "192.168.1.103",
                 "192.168.0.100", "192.168.0.101", "192.168.0.102", "192.168.0.103",
                 "10.0.0.100", "10.0.0.101", "10.0.0.102", "10.0.0.103"
             ]
             
-            for ip in common_ips:
-                for port in discovery_ports:
-                    try:
-                        url = f"http://{ip}:{port}/discover"
-                        with urllib.request.urlopen(url, timeout=1) as response:
-                            if response.status == 200:
-                                data = json.loads(response.read().decode('utf-8'))
-                                server_ip = data.get('server_ip')
-                                if server_ip:
-                                    self.logger.info(f"Found discovery service at {ip}:{port}")
-                                    return server_ip
-                    except Exception:
-                        continue
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                futures = {
+                    executor.submit(self._probe_discovery_endpoint, ip, port): (ip, port)
+                    for ip in common_ips for port in discovery_ports
+                }
+                for future in as_completed(futures):
+                    server_ip = future.result()
+                    if server_ip:
+                        ip, port = futures[future]
+                        for pending in futures:
+                            pending.cancel()
+                        self.logger.info(f"Found discovery service at {ip}:{port}")
+                        return server_ip
                             
         except Exception as e:
             self.logger.debug(f"Discovery service not available: {e}")
         
         return None
     
+    @staticmethod
+    def _credential_params(params: Dict[str, Any]) -> Dict[str, Any]:
+        """Filter connection params down to the keys save_config persists.
+
+        The full set also carries session/handshake options (autocommit,
+        charset, ...) that save_config's signature rejects.
+        """
+        return {k: params[k] for k in _CREDENTIAL_DEFAULTS if k in params}
+
     def connect(self, host_ip: Optional[str] = None, **kwargs) -> bool:
         """Connect to database with fallback options."""
-        # Set default credentials if not provided
-        default_credentials = {
-            "user": "root",
-            "password": "Meridian0723",
-            "database": "MyACG_data",
-            "port": 3306
-        }
-        
-        # Update with provided kwargs, keeping defaults for missing values
-        connection_params = default_credentials.copy()
-        connection_params.update(kwargs)
-        
+        # One C-level merge: provided kwargs win, frozen defaults fill the rest
+        connection_params = {**_CONNECT_DEFAULTS, **kwargs}
+        credentials = self._credential_params(connection_params)
+
         if host_ip:
-            # User provided IP - test and use it
-            if self.test_connection(host_ip, **connection_params):
-                self.host_ip = host_ip
-                self.save_config(host_ip, **connection_params)
-                return self._establish_connection(host_ip, **connection_params)
+            # User provided IP — connect directly; a live connection is the
+            # strongest reachability proof, so no separate test handshake
+            if self._establish_connection(host_ip, **connection_params):
+                self.save_config(host_ip, **credentials)
+                return True
             else:
                 return False
-        
+
+        # Common case: the LAN hasn't changed since last run, so try the
+        # saved host with a direct connect before paying for discovery
+        saved_config = self.load_saved_config()
+        if saved_config and saved_config.get('host'):
+            if self._establish_connection(saved_config['host'], **connection_params):
+                self.save_config(saved_config['host'], **credentials)
+                return True
+            self.logger.info(f"Saved host {saved_config['host']} unreachable, running discovery")
+
         # Try to discover host IP
         discovered_ip = self.discover_host_ip()
         if discovered_ip:
             # Remove 'host' from kwargs if it exists to avoid duplicate parameter
             connection_params.pop('host', None)  # Remove host if present
-            return self._establish_connection(discovered_ip, **connection_params)
+            if self._establish_connection(discovered_ip, **connection_params):
+                self.save_config(discovered_ip, **credentials)
+                return True
+            return False
         
         # No connection possible
         self.is_connected = False
@@ -1399,22 +1861,37 @@ class DatabaseConnectionManager:
     def _establish_connection(self, host_ip: str, **kwargs) -> bool:
         """Establish the actual database connection."""
         try:
-            # Add timeout to prevent hanging
+            # Add timeout to prevent hanging. 10s meant a misconfigured LAN
+            # burned 10s per dead candidate before falling through to
+            # discovery; 3s is ample for a LAN handshake and DB_CONNECT_TIMEOUT
+            # lets slower networks raise it
             connection_kwargs = kwargs.copy()
-            connection_kwargs['connect_timeout'] = 10  # 10 second timeout for main connection
+            connection_kwargs['connect_timeout'] = int(os.getenv('DB_CONNECT_TIMEOUT', '3'))
             
             if MYSQL_AVAILABLE:
-                self.connection = mysql.connector.connect(
-                    host=host_ip,
-                    **connection_kwargs
+                # Keep a connection pool so repeat work amortizes the
+                # TCP + auth handshake instead of paying it per connection.
+                # pool_reset_session=False skips the COM_RESET_CONNECTION
+                # round trip on every checkout; these connections only read
+                # and write with autocommit semantics, so no session state
+                # needs scrubbing between uses.
+                try:
+                    self.pool = mysql.connector.pooling.MySQLConnectionPool(
+                        pool_name='packing_elf_pool',
+                        pool_size=int(os.getenv('DB_POOL_SIZE', '10')),
+                        pool_reset_session=False,
+                        host=host_ip,
+                        **connection_kwargs
+                    )
+                except Exception as pool_error:
+                    self.logger.warning(f"Connection pooling unavailable, using single connection: {pool_error}")
+                    self.pool = None
+                self.connection = (
+                    self.pool.get_connection() if self.pool
+                    else _connect_fn(host=host_ip, **connection_kwargs)
                 )
             else:
-                # Fallback to pymysql
-                import pymysql
-                self.connection = pymysql.connect(
-                    host=host_ip,
-                    **connection_kwargs
-                )
+                self.connection = _connect_fn(host=host_ip, **connection_kwargs)
             
             self.is_connected = True
             self.host_ip = host_ip
@@ -1426,7 +1903,50 @@ class DatabaseConnectionManager:
             return False
     
     def get_connection(self):
-        """Get the current database connection."""
+        """Get a database connection, preferring a pool checkout.
+
+        When the pool exists, callers receive a pooled connection and must
+        close() it to return it to the pool; otherwise the long-lived
+        primary connection is returned as before.
+
+        The pool hands connections back without a session reset
+        (pool_reset_session=False), so ``@@session.*`` variables, temporary
+        tables, or user variables set on a checkout may still be visible on
+        the next one — callers must not set or rely on per-session state.
+        """
+        if self.pool:
+            try:
+                return self.pool.get_connection()
+            except Exception as e:
+                self.logger.warning(f"Pool checkout failed, using primary connection: {e}")
+        if self.connection is None:
+            self.connect()
+            return self.connection
+        try:
+            # Servers drop idle connections; ping revives the existing
+            # socket in place and only reconnects when it is truly dead,
+            # instead of letting the next query fail and force a full
+            # rediscovery-and-connect cycle
+            self.connection.ping(reconnect=True, attempts=2, delay=0)
+        except TypeError:
+            # MySQLdb/pymysql ping takes only the reconnect flag
+            self.connection.ping(True)
+        except Exception as e:
+            self.logger.warning(f"Connection ping failed, reconnecting: {e}")
+            self.connect()
+        return self.connection
+
+    def get_pooled_connection(self):
+        """Check out a connection from the pool (close() returns it).
+
+        Falls back to the primary connection when pooling is unavailable
+        (fallback-driver path or pool creation failure).
+        """
+        if self.pool:
+            try:
+                return self.pool.get_connection()
+            except Exception as e:
+                self.logger.warning(f"Pool checkout failed, using primary connection: {e}")
         return self.connection
     
     def close(self):
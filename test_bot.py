@@ -3,6 +3,7 @@
 Test script for bot query processing
 """
 
+import asyncio
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -10,32 +11,51 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from query_handler import query_handler
 from database_reader import db_reader
 
-def test_queries():
+# uvloop's libuv-based event loop is noticeably faster than stock asyncio;
+# use it when installed, fall back silently otherwise
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+async def test_queries():
     """Test various queries to ensure they work correctly."""
-    
+
     # Test queries
     test_cases = [
         "搜尋訂單號12345",
-        "查找客戶張三的訂單", 
+        "查找客戶張三的訂單",
         "顯示最近10個訂單",
         "搜尋產品SKU MIZ001",
         "顯示mizuki分類的產品"
     ]
-    
+
     print("Testing bot query processing...")
     print("=" * 50)
-    
-    for query in test_cases:
+
+    # Gather the queries through the async wrapper; each runs in a worker
+    # thread, and the wrapper serialises the actual DB work on one lock
+    # since they all share db_reader's single connection
+    tasks = [
+        query_handler.process_question_async(query)
+        for query in test_cases
+    ]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for query, result in zip(test_cases, results):
         print(f"\nQuery: {query}")
+        if isinstance(result, Exception):
+            print(f"Error: {result}")
+            continue
         try:
-            result = query_handler.process_question(query)
             response = query_handler.format_response(result)
             print(f"Response: {response}")
         except Exception as e:
             print(f"Error: {e}")
-    
+
     print("\n" + "=" * 50)
     print("Test completed!")
 
 if __name__ == "__main__":
-    test_queries() 
\ No newline at end of file
+    asyncio.run(test_queries())
@@ -9,14 +9,16 @@ from pathlib import Path
 src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
-from database_reader import db_reader
+from concurrent.futures import ThreadPoolExecutor
+
+from database_reader import db_reader, ReadOnlyDatabaseService
 from query_handler import query_handler
 
 def test_database_connection():
     """Test database connection."""
     print("🔍 測試資料庫連接...")
     
-    if db_reader.connect():
+    if db_reader.is_connected:
         print("✅ 資料庫連接成功")
         
         # Test health check
@@ -28,37 +30,31 @@ def test_database_connection():
         print("❌ 資料庫連接失敗")
         return False
 
-def test_order_queries():
+def test_order_queries(reader=db_reader):
     """Test order queries."""
     print("\n🔍 測試訂單查詢...")
-    
-    # Test specific order IDs
+
+    # Test specific order IDs; one IN query covers every lookup instead
+    # of up to two round trips per ID
     test_orders = ["ORD002", "PG02612345", "12345", "1"]
-    
+    numeric_ids = [int(order_id) for order_id in test_orders if order_id.isdigit()]
+
+    found = reader.get_orders_bulk(test_orders, numeric_ids)
+
     for order_id in test_orders:
         print(f"\n查詢訂單: {order_id}")
-        
-        # Test external ID first
-        order = db_reader.get_order_by_external_id(order_id)
+        order = found.get(order_id)
         if order:
-            print(f"✅ 找到訂單 (external_id): {order}")
+            id_kind = "external_id" if str(order.get('external_order_id')) == order_id else "numeric_id"
+            print(f"✅ 找到訂單 ({id_kind}): {order}")
         else:
-            # Test numeric ID
-            try:
-                order_id_int = int(order_id)
-                order = db_reader.get_order_by_id(order_id_int)
-                if order:
-                    print(f"✅ 找到訂單 (numeric_id): {order}")
-                else:
-                    print(f"❌ 未找到訂單: {order_id}")
-            except ValueError:
-                print(f"❌ 未找到訂單: {order_id}")
-
-def test_recent_orders():
+            print(f"❌ 未找到訂單: {order_id}")
+
+def test_recent_orders(reader=db_reader):
     """Test recent orders query."""
     print("\n🔍 測試最近訂單查詢...")
-    
-    orders = db_reader.get_recent_orders(5)
+
+    orders = reader.get_recent_orders(5)
     print(f"找到 {len(orders)} 個最近訂單:")
     
     for order in orders:
@@ -80,18 +76,50 @@ def test_query_handler():
         result = query_handler.process_question(query)
         print(f"結果: {result}")
 
+def _phase_on_own_connection(phase):
+    """Run one test phase on a private connection.
+
+    mysql.connector connections are not thread-safe, so concurrent phases
+    must not share db_reader's session; each gets its own, reusing the
+    host db_reader already found.
+    """
+    reader = ReadOnlyDatabaseService()
+    if not reader.connect(db_reader.host_ip):
+        print(f"❌ 無法為 {phase.__name__} 建立連接")
+        return
+    try:
+        phase(reader)
+    finally:
+        reader.close()
+
 def main():
     """Main test function."""
     print("🚀 開始資料庫測試...")
-    
-    if not test_database_connection():
-        print("❌ 無法繼續測試，資料庫未連接")
+
+    # One shared connection for the whole run: every test reuses the same
+    # authenticated session instead of reconnecting per call
+    try:
+        with db_reader.session():
+            if not test_database_connection():
+                print("❌ 無法繼續測試，資料庫未連接")
+                return
+
+            # The three phases are independent, so run them concurrently on
+            # separate connections; wall-clock is the slowest phase instead
+            # of the sum. test_query_handler keeps the shared session since
+            # query_handler talks to the global db_reader.
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                futures = [
+                    executor.submit(_phase_on_own_connection, test_order_queries),
+                    executor.submit(_phase_on_own_connection, test_recent_orders),
+                    executor.submit(test_query_handler),
+                ]
+                for future in futures:
+                    future.result()
+    except Exception as e:
+        print(f"❌ 無法繼續測試，資料庫未連接: {e}")
         return
-    
-    test_order_queries()
-    test_recent_orders()
-    test_query_handler()
-    
+
     print("\n✅ 測試完成")
 
 if __name__ == "__main__":
@@ -21,31 +21,22 @@ def test_connection():
         )
         cursor = connection.cursor()
         
-        # Check if database exists
-        cursor.execute("SHOW DATABASES")
-        databases = [db[0] for db in cursor.fetchall()]
-        
-        if 'MyACG_data' not in databases:
-            logger.info("Database 'MyACG_data' does not exist, creating it...")
-            cursor.execute("CREATE DATABASE MyACG_data")
-            logger.info("Database 'MyACG_data' created successfully")
-        else:
-            logger.info("Database 'MyACG_data' already exists")
-        
-        cursor.close()
-        connection.close()
-        
-        # Test connection to the specific database
-        connection = mysql.connector.connect(
-            host='localhost',
-            port=3306,
-            user='root',
-            password='Meridian0723',
-            database='MyACG_data'
+        # One idempotent statement covers both the existence check and the
+        # create: no separate probe round trip needed
+        cursor.execute(
+            "CREATE DATABASE IF NOT EXISTS MyACG_data "
+            "CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"
         )
-        cursor = connection.cursor()
+        logger.info("Database 'MyACG_data' is ready")
+        
+        # Switch to the database on the same connection instead of paying
+        # a second TCP + auth handshake just to run the probe
+        cursor.execute("USE MyACG_data")
         cursor.execute("SELECT 1")
         result = cursor.fetchone()
+
+        cursor.close()
+        connection.close()
         
         if result and result[0] == 1:
             logger.info("Database connection successful!")